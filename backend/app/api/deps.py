@@ -0,0 +1,28 @@
+"""Request-scoped accessors for the singletons built in the app lifespan."""
+
+from pathlib import Path
+
+from fastapi import Request
+from openai import AsyncAzureOpenAI
+
+from ..core.config import Settings, get_settings
+from ..services.docx_generator import INCIDENT_TEMPLATE_PATH
+from ..services.llm import get_llm_client
+
+
+def get_app_settings(request: Request) -> Settings:
+    """Settings warmed at startup (falls back to the cached instance)."""
+
+    return getattr(request.app.state, "settings", None) or get_settings()
+
+
+def get_llm(request: Request) -> AsyncAzureOpenAI:
+    """Shared Azure chat client stored on ``app.state`` by the lifespan."""
+
+    return getattr(request.app.state, "llm", None) or get_llm_client()
+
+
+def get_docx_template_path(request: Request) -> Path:
+    """Incident DOCX template path resolved once at startup."""
+
+    return getattr(request.app.state, "docx_template_path", None) or INCIDENT_TEMPLATE_PATH
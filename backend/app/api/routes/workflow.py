@@ -1,40 +1,165 @@
 """REST endpoints driving the transcription → template → report workflow."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from io import BytesIO
 from pathlib import Path
+from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, status
+import orjson
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 from fastapi.responses import StreamingResponse
+from openai import AsyncAzureOpenAI
 
 from ...models.schemas import (
     AutoPipelineRequest,
     AutoPipelineResponse,
     DocxDownloadRequest,
+    IncidentFields,
     ReportGenerationRequest,
     ReportGenerationResponse,
     TemplateInferenceRequest,
     TemplateInferenceResponse,
     TranscriptionRequest,
     TranscriptionResponse,
+    TranscriptionTemplateResponse,
 )
 from ...services.docx_generator import generate_incident_docx
+from ...services.pipeline import transcribe_and_infer
 from ...services.report import generate_report
-from ...services.stt import transcribe_audio
+from ...services.stt import decode_audio, transcribe_audio
 from ...services.template import infer_template
+from ..deps import get_docx_template_path, get_llm
 
 router = APIRouter(tags=["workflow"])
 
+DOCX_CHUNK_SIZE = 64 * 1024
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def _decode_audio_or_400(audio_b64: str) -> bytes:
+    """Decode the request audio off the event loop, surfacing bad payloads as 400s."""
+
+    try:
+        return await decode_audio(audio_b64)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+async def _read_upload_or_400(audio: UploadFile) -> bytes:
+    """Raw bytes of a multipart audio upload; an empty file is a client error."""
+
+    audio_bytes = await audio.read()
+    if not audio_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Audio file cannot be empty."
+        )
+    return audio_bytes
+
+
+def _field_values(fields: IncidentFields | dict[str, str]) -> dict[str, str]:
+    """Plain label -> value dict whichever shape the payload validated as."""
+
+    return fields.as_dict() if isinstance(fields, IncidentFields) else fields
+
+
+async def _run_pipeline(
+    audio_bytes: bytes, language: Optional[str], llm: AsyncAzureOpenAI
+) -> AutoPipelineResponse:
+    """Transcribe, extract the fields and build the report for one recording."""
+
+    text, template, fields = await transcribe_and_infer(audio_bytes, language, client=llm)
+    report_text = generate_report(template, fields, text)
+    return AutoPipelineResponse(
+        text=text, template_type=template, fields=fields, report_text=report_text
+    )
+
+
+def _sse_frame(event: str, data: dict[str, Any]) -> bytes:
+    """One server-sent event; orjson output never contains a newline."""
+
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _pipeline_events(
+    audio_bytes: bytes, language: Optional[str], llm: AsyncAzureOpenAI
+) -> AsyncIterator[bytes]:
+    """Run the auto pipeline, emitting ``transcript``, ``fields`` and ``report`` as ready.
+
+    The stream always ends with ``done``, or with ``error`` carrying a ``detail``
+    (the status code is already sent by then, so failures travel as an event).
+    """
+
+    transcript: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+    pipeline = asyncio.create_task(
+        transcribe_and_infer(audio_bytes, language, client=llm, on_transcript=transcript.set_result)
+    )
+    try:
+        # set_result runs synchronously once STT is done, so a finished pipeline
+        # always has its transcript resolved too.
+        await asyncio.wait({pipeline, transcript}, return_when=asyncio.FIRST_COMPLETED)
+        if transcript.done():
+            yield _sse_frame("transcript", {"text": transcript.result()})
+
+        text, template, fields = await pipeline
+        yield _sse_frame("fields", {"template_type": template, "fields": fields})
+        report_text = generate_report(template, fields, text)
+        yield _sse_frame("report", {"report_text": report_text})
+        yield _sse_frame("done", {})
+    except Exception as exc:  # noqa: BLE001 - reported to the client as an event
+        yield _sse_frame("error", {"detail": f"Pipeline failed: {exc}"})
+    finally:
+        transcript.cancel()
+        pipeline.cancel()
+
+
+async def _iter_buffer(buffer: BytesIO) -> AsyncIterator[bytes]:
+    """Yield the buffer in fixed-size chunks so the response starts right away."""
+
+    with buffer:
+        while chunk := buffer.read1(DOCX_CHUNK_SIZE):
+            yield chunk
+
 
 @router.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe(payload: TranscriptionRequest) -> TranscriptionResponse:
     """Turn the base64 audio sent by Streamlit into text."""
 
-    text = await transcribe_audio(payload.audio_b64, payload.language)
+    audio_bytes = await _decode_audio_or_400(payload.audio_b64)
+    text = await transcribe_audio(audio_bytes, payload.language)
+    return TranscriptionResponse(text=text)
+
+
+@router.post("/transcribe/upload", response_model=TranscriptionResponse)
+async def transcribe_upload(
+    audio: UploadFile = File(..., description="Recorded audio file (WAV/FLAC/Opus)."),
+    language: Optional[str] = Form(default=None),
+) -> TranscriptionResponse:
+    """Same as /transcribe for a multipart upload, skipping the base64 round-trip."""
+
+    audio_bytes = await _read_upload_or_400(audio)
+    text = await transcribe_audio(audio_bytes, language)
     return TranscriptionResponse(text=text)
 
 
+@router.post("/transcribe/template/upload", response_model=TranscriptionTemplateResponse)
+async def transcribe_and_infer_upload(
+    audio: UploadFile = File(..., description="Recorded audio file (WAV/FLAC/Opus)."),
+    language: Optional[str] = Form(default=None),
+    llm: AsyncAzureOpenAI = Depends(get_llm),
+) -> TranscriptionTemplateResponse:
+    """Transcribe an upload and pre-fill the template fields in a single call."""
+
+    audio_bytes = await _read_upload_or_400(audio)
+    text, template, fields = await transcribe_and_infer(audio_bytes, language, client=llm)
+    return TranscriptionTemplateResponse(text=text, template_type=template, fields=fields)
+
+
 @router.post("/report/template", response_model=TemplateInferenceResponse)
 async def infer_template_route(
     payload: TemplateInferenceRequest,
+    llm: AsyncAzureOpenAI = Depends(get_llm),
 ) -> TemplateInferenceResponse:
     """Extract fields for the incident template based on the transcript."""
 
@@ -45,7 +170,7 @@ async def infer_template_route(
             detail="Transcript cannot be empty.",
         )
 
-    template, fields = await infer_template(transcript)
+    template, fields = await infer_template(transcript, client=llm)
     return TemplateInferenceResponse(template_type=template, fields=fields)
 
 
@@ -55,65 +180,91 @@ async def generate_report_route(
 ) -> ReportGenerationResponse:
     """Build the formatted report once the fields look good."""
 
-    if not payload.fields:
+    fields = _field_values(payload.fields)
+    if not fields:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least one field is required to build the report.",
         )
 
-    report_text = generate_report(payload.template_type, payload.fields, payload.transcript)
+    report_text = generate_report(payload.template_type, fields, payload.transcript)
     return ReportGenerationResponse(report_text=report_text)
 
 
 @router.post("/pipeline/auto", response_model=AutoPipelineResponse)
-async def auto_pipeline(payload: AutoPipelineRequest) -> AutoPipelineResponse:
+async def auto_pipeline(
+    payload: AutoPipelineRequest,
+    llm: AsyncAzureOpenAI = Depends(get_llm),
+) -> AutoPipelineResponse:
     """Run transcription, inference, and report in one go."""
 
-    text = await transcribe_audio(payload.audio_b64, payload.language)
-    template, fields = await infer_template(text)
-    report_text = generate_report(template, fields, text)
-    return AutoPipelineResponse(
-        text=text, template_type=template, fields=fields, report_text=report_text
+    audio_bytes = await _decode_audio_or_400(payload.audio_b64)
+    return await _run_pipeline(audio_bytes, payload.language, llm)
+
+
+@router.post("/pipeline/auto/upload", response_model=AutoPipelineResponse)
+async def auto_pipeline_upload(
+    audio: UploadFile = File(..., description="Recorded audio file (WAV/FLAC/Opus)."),
+    language: Optional[str] = Form(default=None),
+    llm: AsyncAzureOpenAI = Depends(get_llm),
+) -> AutoPipelineResponse:
+    """Same as /pipeline/auto for a multipart upload, skipping the base64 round-trip."""
+
+    audio_bytes = await _read_upload_or_400(audio)
+    return await _run_pipeline(audio_bytes, language, llm)
+
+
+@router.post("/pipeline/auto/upload/stream")
+async def auto_pipeline_upload_stream(
+    audio: UploadFile = File(..., description="Recorded audio file (WAV/FLAC/Opus)."),
+    language: Optional[str] = Form(default=None),
+    llm: AsyncAzureOpenAI = Depends(get_llm),
+) -> StreamingResponse:
+    """Same as /pipeline/auto/upload, streaming each stage as a server-sent event."""
+
+    audio_bytes = await _read_upload_or_400(audio)
+    return StreamingResponse(
+        _pipeline_events(audio_bytes, language, llm),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache"},
     )
 
 
 @router.post("/report/download/docx")
-async def download_docx(payload: DocxDownloadRequest) -> StreamingResponse:
+async def download_docx(
+    payload: DocxDownloadRequest,
+    template_path: Path = Depends(get_docx_template_path),
+) -> StreamingResponse:
     """Generate and download a DOCX report from the template."""
 
-    if not payload.fields:
+    fields = _field_values(payload.fields)
+    if not fields:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least one field is required to generate the DOCX.",
         )
 
-    template_path = Path(__file__).resolve().parents[2] / "assets" / "Template_incident.docx"
-
     if not template_path.exists():
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Template not found at {template_path}",
         )
 
-    # Generate DOCX bytes
+    # Generate the DOCX into an in-memory buffer
     try:
-        docx_bytes = generate_incident_docx(payload.fields, template_path)
+        buffer = generate_incident_docx(fields, template_path)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate DOCX: {str(e)}",
         )
 
-    # Return as downloadable file
-    from io import BytesIO
-
-    buffer = BytesIO(docx_bytes)
-    buffer.seek(0)
-
-    filename = f"rapport_incident_{payload.fields.get('Date de découverte', 'sans_date').replace('/', '-')}.docx"
+    filename = (
+        f"rapport_incident_{fields.get('Date de découverte', 'sans_date').replace('/', '-')}.docx"
+    )
 
     return StreamingResponse(
-        buffer,
+        _iter_buffer(buffer),
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -1,7 +1,8 @@
 """Central place for Site Reporter settings."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import Any, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,10 +18,17 @@ class Settings(BaseSettings):
 
     stt_deployment_name: str = "gpt-4o-transcribe"
     stt_api_version: str = "2025-03-01-preview"
+    stt_requests_per_minute: int = 0  # 0 disables client-side throttling
+    stt_streaming: bool = True  # stream the pipeline transcript (gpt-4o-transcribe models)
     default_language: str = "fr"
 
     mistral_deployment_name: str = "mistral-small-2503"
     mistral_api_version: str = "2024-05-01-preview"
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+    llm_json_mode: bool = True  # response_format=json_object for the field extraction
+    llm_cache_mode: Literal["enabled", "read_only", "write_only", "replay", "disabled"] = "enabled"
+    llm_cache_path: Optional[Path] = None  # SQLite file shared across workers
 
     default_template: str = "rapport_generique"
     project_name: str = "Site Reporter API"
@@ -30,17 +38,24 @@ class Settings(BaseSettings):
         env_file=str(ENV_FILE),
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
-    @property
+    def model_post_init(self, __context: Any) -> None:
+        """Build the derived endpoint URLs up front so reads are plain lookups."""
+
+        self.stt_endpoint  # noqa: B018 - warm the cached_property
+        self.mistral_endpoint  # noqa: B018
+
+    @cached_property
     def stt_endpoint(self) -> str:
-        """Full STT endpoint URL baked from the Azure pieces."""
+        """Full STT endpoint URL baked from the Azure pieces (built once per instance)."""
         return (
             f"{self.azure_endpoint}/openai/deployments/{self.stt_deployment_name}/"
             f"audio/transcriptions?api-version={self.stt_api_version}"
         )
 
-    @property
+    @cached_property
     def mistral_endpoint(self) -> str:
         """Full Mistral chat endpoint used by the LLM helper."""
         return (
@@ -1,16 +1,52 @@
 """FastAPI bootstrap for the Site Reporter backend."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .api import api_router
 from .core.config import get_settings
+from .core.logging import configure_logging, shutdown_logging
+from .services.docx_generator import INCIDENT_TEMPLATE_PATH
+from .services.http_client import close_http_client, get_http_client
+from .services.llm import (
+    close_llm_client,
+    close_response_store,
+    get_llm_client,
+    get_response_store,
+)
+from .services.stt import close_stt_client, get_stt_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build shared settings, clients and asset paths once; close clients on shutdown."""
+
+    configure_logging()
+    app.state.settings = get_settings()
+    app.state.http = get_http_client()
+    app.state.llm = get_llm_client()
+    app.state.stt = get_stt_client()
+    app.state.llm_cache_store = get_response_store()
+    app.state.docx_template_path = INCIDENT_TEMPLATE_PATH
+    yield
+    await close_llm_client()
+    await close_stt_client()
+    await close_http_client()
+    close_response_store()
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
     """Spin up the FastAPI app with config and routers."""
 
     settings = get_settings()
-    app = FastAPI(title=settings.project_name, version="0.1.0")
+    app = FastAPI(
+        title=settings.project_name,
+        version="0.1.0",
+        lifespan=lifespan,
+    )
 
     @app.get("/health", tags=["health"])
     async def health_check() -> dict[str, str]:
@@ -1,14 +1,16 @@
 """Typed payloads passed between the Streamlit UI and FastAPI."""
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 
 class TranscriptionRequest(BaseModel):
     """What the UI sends after recording audio."""
 
-    audio_b64: str = Field(..., description="Base64-encoded audio bytes.")
+    audio_b64: str = Field(
+        ..., description="Base64-encoded audio bytes (standard or URL-safe alphabet)."
+    )
     language: Optional[str] = Field(
         default=None, description="Optional BCP-47 language hint for transcription."
     )
@@ -35,11 +37,58 @@ class TemplateInferenceResponse(BaseModel):
     )
 
 
+class TranscriptionTemplateResponse(TemplateInferenceResponse):
+    """Transcript plus the inferred template, for the manual flow's first step."""
+
+    text: str = Field(..., description="Raw transcription from the STT model.")
+
+
+class IncidentFields(BaseModel):
+    """The 12 incident template fields, validated as a typed model.
+
+    Payloads carrying exactly these keys take pydantic's specialized model
+    path; anything else (custom rows, snake_case keys) falls back to a plain dict.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    _label_order: Tuple[str, ...] = PrivateAttr(default=())
+
+    nom_du_chantier: str = Field(default="", alias="Nom du chantier")
+    nom_de_l_incident: str = Field(default="", alias="Nom de l'incident")
+    emetteur_du_signalement: str = Field(default="", alias="Emetteur du signalement")
+    date_de_decouverte: str = Field(default="", alias="Date de découverte")
+    heure_de_decouverte: str = Field(default="", alias="Heure de découverte")
+    adresse: str = Field(default="", alias="Adresse")
+    nature_de_l_incident: str = Field(default="", alias="Nature de l'incident")
+    description_de_l_incident: str = Field(default="", alias="Description de l'incident")
+    risques_identifies: str = Field(default="", alias="Risques identifiés")
+    actions_a_realiser: str = Field(default="", alias="Actions à réaliser")
+    niveau_d_urgence: str = Field(default="", alias="Niveau d'urgence")
+    personnes_prevenues: str = Field(default="", alias="Personnes prévenues")
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _remember_label_order(cls, data: Any, handler: Any) -> "IncidentFields":
+        fields = handler(data)
+        if isinstance(data, dict):
+            fields._label_order = tuple(data)
+        return fields
+
+    def as_dict(self) -> Dict[str, str]:
+        """Fields the client actually sent, keyed by their French labels, in sent order."""
+
+        values = self.model_dump(by_alias=True, exclude_unset=True)
+        return {label: values[label] for label in self._label_order or values}
+
+
 class ReportGenerationRequest(BaseModel):
     """Everything needed to build the final report text."""
 
     template_type: str = Field(..., description="Template to fill.")
-    fields: Dict[str, str] = Field(..., description="Structured inputs for the template.")
+    fields: Union[IncidentFields, Dict[str, str]] = Field(
+        ..., union_mode="left_to_right", description="Structured inputs for the template."
+    )
     transcript: Optional[str] = Field(
         default=None, description="Optional transcript for additional context."
     )
@@ -72,7 +121,11 @@ class AutoPipelineResponse(BaseModel):
 class DocxDownloadRequest(BaseModel):
     """Request to download a DOCX report."""
 
-    fields: Dict[str, str] = Field(..., description="Structured inputs for the DOCX template.")
+    fields: Union[IncidentFields, Dict[str, str]] = Field(
+        ...,
+        union_mode="left_to_right",
+        description="Structured inputs for the DOCX template.",
+    )
     template_type: Optional[str] = Field(
         default="probleme_decouverte", description="Template type to use."
     )
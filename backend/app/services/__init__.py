@@ -1,4 +1,11 @@
-from .llm import chat_completion
-from .stt import transcribe_audio
+from .llm import chat_completion, close_llm_client, get_llm_client
+from .stt import close_stt_client, get_stt_client, transcribe_audio
 
-__all__ = ["chat_completion", "transcribe_audio"]
+__all__ = [
+    "chat_completion",
+    "close_llm_client",
+    "close_stt_client",
+    "get_llm_client",
+    "get_stt_client",
+    "transcribe_audio",
+]
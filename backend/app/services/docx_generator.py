@@ -2,16 +2,67 @@
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import unicodedata
 
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import Pt, RGBColor
+# python-docx (and lxml) are imported inside the functions that need them so the
+# API process does not pay for them until the first DOCX download.
+
+INCIDENT_TEMPLATE_PATH = Path(__file__).resolve().parents[1] / "assets" / "Template_incident.docx"
+
+# Field mapping: template field name -> extracted field name
+FIELD_MAPPING: Dict[str, str] = {
+    "Nom du chantier": "Nom du chantier",
+    "Nom de l'incident": "Nom de l'incident",
+    "Emetteur du signalement": "Emetteur du signalement",
+    "Date de découverte": "Date de découverte",
+    "Heure de découverte": "Heure de découverte",
+    "Adresse": "Adresse",
+    "Nature de l'incident": "Nature de l'incident",
+    "Description de l'incident": "Description de l'incident",
+    "Risques identifiés": "Risques identifiés",
+    "Actions à réaliser": "Actions à réaliser",
+    "Niveau d'urgence": "Niveau d'urgence",
+    "Personnes prévenues": "Personnes prévenues",
+}
+
+# Per-field match data (label, lower-cased label, "{label}", "[label]", extracted key),
+# built once so the row loop never re-lowers or re-formats placeholder strings.
+_NORMALIZED_MAPPING: Tuple[Tuple[str, str, str, str, str], ...] = tuple(
+    (
+        template_field,
+        template_field.lower(),
+        f"{{{template_field}}}",
+        f"[{template_field}]",
+        extracted_field,
+    )
+    for template_field, extracted_field in FIELD_MAPPING.items()
+)
+
+# Exact normalized label -> match data. No field label contains another, so when a row
+# has no placeholder brackets an exact hit is the same field the linear scan would pick.
+_MAPPING_BY_LABEL: Dict[str, Tuple[str, str, str, str, str]] = {
+    entry[1]: entry for entry in _NORMALIZED_MAPPING
+}
+
+# One alternation over every "{field}" / "[field]" token so loose placeholders
+# are replaced in a single scan of the cell text.
+_FIELD_ALTERNATION = "|".join(re.escape(field) for field in FIELD_MAPPING)
+_PLACEHOLDER_RE = re.compile(rf"\{{({_FIELD_ALTERNATION})\}}|\[({_FIELD_ALTERNATION})\]")
+
+# Curly apostrophe -> straight, drop colons, non-breaking space -> space, in one pass.
+_LABEL_TRANSLATION = str.maketrans({"’": "'", ":": None, "\xa0": " "})
+
+
+@lru_cache(maxsize=4)
+def _template_bytes(template_path: Path) -> bytes:
+    """Read a template once; later documents are parsed from the cached bytes."""
+
+    return template_path.read_bytes()
 
 
 def _strip_placeholder(text: str, field: str) -> str:
@@ -20,28 +71,49 @@ def _strip_placeholder(text: str, field: str) -> str:
     return text.replace(f"{{{field}}}", "").replace(f"[{field}]", "").strip()
 
 
-def _replace_generic_placeholders(
-    text: str, fields: Dict[str, str], field_mapping: Dict[str, str]
-) -> str:
+def _replace_generic_placeholders(text: str, fields: Dict[str, str]) -> str:
     """Fallback replacement for any loose placeholders outside the main table layout."""
 
-    for template_field, extracted_field in field_mapping.items():
-        value = fields.get(extracted_field, "")
-        text = text.replace(f"{{{template_field}}}", value)
-        text = text.replace(f"[{template_field}]", value)
-    return text
+    return _PLACEHOLDER_RE.sub(
+        lambda match: fields.get(FIELD_MAPPING[match.group(1) or match.group(2)], ""), text
+    )
 
 
 def _normalize_label(text: str) -> str:
     """Normalize a label for matching (remove colon/spacing, lowercase)."""
 
-    normalized = unicodedata.normalize("NFKC", text)
-    normalized = normalized.replace("’", "'")
-    normalized = normalized.replace(":", "")
-    normalized = normalized.replace("\xa0", " ")
+    normalized = unicodedata.normalize("NFKC", text).translate(_LABEL_TRANSLATION)
     return normalized.strip().lower()
 
 
+def _match_row(
+    left_label: str, left_text: str, right_text: str
+) -> Optional[Tuple[str, str, str, str, str]]:
+    """Find the mapped field for a two-column row, or None.
+
+    Matches by label presence in the left column or an explicit placeholder in either
+    cell; plain label rows resolve with one dict lookup before falling back to the scan.
+    """
+
+    cell_texts = left_text + right_text
+    if "{" not in cell_texts and "[" not in cell_texts:
+        entry = _MAPPING_BY_LABEL.get(left_label)
+        if entry is not None:
+            return entry
+
+    for entry in _NORMALIZED_MAPPING:
+        _, norm_field, brace_token, bracket_token, _ = entry
+        if (
+            norm_field in left_label
+            or brace_token in left_text
+            or bracket_token in left_text
+            or brace_token in right_text
+            or bracket_token in right_text
+        ):
+            return entry
+    return None
+
+
 def _date_time_value(fields: Dict[str, str]) -> str:
     """Combine date + time fields for the template row."""
 
@@ -53,9 +125,41 @@ def _date_time_value(fields: Dict[str, str]) -> str:
     return date or time
 
 
+def _set_cell_text(cell, value: str) -> None:
+    """Write ``value`` into the cell's first run and drop any other text content.
+
+    Unlike ``cell.text = value`` this reuses the existing paragraph and run
+    instead of rebuilding them, and leaves the cell untouched when the text
+    is already right.
+    """
+
+    paragraphs = cell.paragraphs
+    if not paragraphs:
+        cell.text = value
+        return
+    if cell.text == value:
+        return
+
+    paragraph = paragraphs[0]
+    runs = paragraph.runs
+    if runs:
+        run = runs[0]
+        for extra_run in runs[1:]:
+            paragraph._p.remove(extra_run._r)
+    else:
+        run = paragraph.add_run()
+    run.text = value
+
+    for extra_paragraph in paragraphs[1:]:
+        cell._tc.remove(extra_paragraph._p)
+
+
 def _set_cell_shading(cell, fill: str) -> None:
     """Apply a background fill color to a cell."""
 
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     tc_pr = cell._tc.get_or_add_tcPr()
     shd = tc_pr.find(qn("w:shd"))
     if shd is None:
@@ -69,6 +173,9 @@ def _set_cell_shading(cell, fill: str) -> None:
 def _style_header_cell(cell) -> None:
     """Style section header cells for clarity."""
 
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
     _set_cell_shading(cell, "e8efff")
     for paragraph in cell.paragraphs:
         paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -82,6 +189,9 @@ def _style_header_cell(cell) -> None:
 def _style_label_cell(cell) -> None:
     """Style label cells (left column)."""
 
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
     _set_cell_shading(cell, "f4f6fb")
     for paragraph in cell.paragraphs:
         paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -95,6 +205,9 @@ def _style_label_cell(cell) -> None:
 def _style_value_cell(cell) -> None:
     """Style value cells (right column)."""
 
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
     for paragraph in cell.paragraphs:
         paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
         paragraph.paragraph_format.space_after = Pt(2)
@@ -104,28 +217,14 @@ def _style_value_cell(cell) -> None:
             run.font.color.rgb = RGBColor(30, 38, 50)
 
 
-def generate_incident_docx(fields: Dict[str, str], template_path: Path) -> bytes:
-    """Fill the incident Word template with extracted data and return bytes."""
-
-    doc = Document(template_path)
-
-    # Field mapping: template field name -> extracted field name
-    field_mapping = {
-        "Nom du chantier": "Nom du chantier",
-        "Nom de l'incident": "Nom de l'incident",
-        "Emetteur du signalement": "Emetteur du signalement",
-        "Date de découverte": "Date de découverte",
-        "Heure de découverte": "Heure de découverte",
-        "Adresse": "Adresse",
-        "Nature de l'incident": "Nature de l'incident",
-        "Description de l'incident": "Description de l'incident",
-        "Risques identifiés": "Risques identifiés",
-        "Actions à réaliser": "Actions à réaliser",
-        "Niveau d'urgence": "Niveau d'urgence",
-        "Personnes prévenues": "Personnes prévenues",
-    }
-
-    # Replace placeholders in tables, ensuring values land in column 2 (right-hand cell)
+def generate_incident_docx(fields: Dict[str, str], template_path: Path) -> BytesIO:
+    """Fill the incident Word template and return the saved document, rewound."""
+
+    from docx import Document
+
+    doc = Document(BytesIO(_template_bytes(template_path)))
+
+    # Single pass: fill each row (values land in column 2, the right-hand cell), then style it
     for table in doc.tables:
         for row in table.rows:
             cells = row.cells
@@ -133,50 +232,29 @@ def generate_incident_docx(fields: Dict[str, str], template_path: Path) -> bytes
 
             if len(cells) >= 2:
                 left_cell, right_cell = cells[0], cells[1]
-                left_label = _normalize_label(left_cell.text)
+                left_text = left_cell.text
+                left_label = _normalize_label(left_text)
 
                 if "date et heure de la découverte" in left_label:
-                    right_cell.text = _date_time_value(fields)
+                    _set_cell_text(right_cell, _date_time_value(fields))
                     matched = True
-                    left_cell.text = _strip_placeholder(left_cell.text, "Date de découverte")
-                    left_cell.text = _strip_placeholder(left_cell.text, "Heure de découverte")
-                    continue
-
-                for template_field, extracted_field in field_mapping.items():
-                    norm_field = template_field.lower()
-                    value = fields.get(extracted_field, "")
-
-                    # Match by label presence in the left column or explicit placeholder
-                    if (
-                        norm_field in left_label
-                        or f"{{{template_field}}}" in left_cell.text
-                        or f"[{template_field}]" in left_cell.text
-                    ):
-                        left_cell.text = _strip_placeholder(left_cell.text, template_field)
-                        right_cell.text = value
-                        matched = True
-                        break
-
-                    # If the placeholder lives in the right cell, swap it for the value
-                    if (
-                        f"{{{template_field}}}" in right_cell.text
-                        or f"[{template_field}]" in right_cell.text
-                    ):
-                        left_cell.text = _strip_placeholder(left_cell.text, template_field)
-                        right_cell.text = _strip_placeholder(right_cell.text, template_field)
-                        right_cell.text = value
+                    stripped = _strip_placeholder(left_text, "Date de découverte")
+                    _set_cell_text(left_cell, _strip_placeholder(stripped, "Heure de découverte"))
+                else:
+                    entry = _match_row(left_label, left_text, right_cell.text)
+                    if entry is not None:
+                        template_field, extracted_field = entry[0], entry[4]
+                        _set_cell_text(left_cell, _strip_placeholder(left_text, template_field))
+                        _set_cell_text(right_cell, fields.get(extracted_field, ""))
                         matched = True
-                        break
 
             # Fallback: replace any straggling placeholders (single-column rows, titles, etc.)
             if not matched:
                 for cell in cells:
-                    cell.text = _replace_generic_placeholders(cell.text, fields, field_mapping)
+                    new_text = _replace_generic_placeholders(cell.text, fields)
+                    _set_cell_text(cell, new_text)
 
-    # Presentation: style headers and columns to keep things readable
-    for table in doc.tables:
-        for row in table.rows:
-            cells = row.cells
+            # Presentation: style headers and columns to keep things readable
             if len(cells) == 1:
                 _style_header_cell(cells[0])
             else:
@@ -188,4 +266,4 @@ def generate_incident_docx(fields: Dict[str, str], template_path: Path) -> bytes
     doc.save(buffer)
     buffer.seek(0)
 
-    return buffer.read()
+    return buffer
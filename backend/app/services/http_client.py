@@ -0,0 +1,27 @@
+"""Shared HTTP connection pool used by every outbound Azure call."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import httpx
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# AsyncAzureOpenAI adopts this client's timeout: keep the SDK's 600 s default for
+# reads (long recordings take a while to transcribe), but fail fast on connect.
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """One HTTP/2 client so STT and LLM calls multiplex over warm connections."""
+
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+async def close_http_client() -> None:
+    """Close the pooled connections (called on app shutdown)."""
+
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
@@ -2,31 +2,130 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from openai import AsyncAzureOpenAI
 from openai import OpenAIError
 
 from ..core.config import get_settings
+from .http_client import get_http_client
+from .llm_cache import (
+    READ_MODES,
+    WRITE_MODES,
+    CacheMissError,
+    CacheMode,
+    ResponseCache,
+    SQLiteResponseStore,
+    cache_key,
+)
+from .rate_limit import estimate_tokens, get_llm_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+LLM_CACHE_SIZE = 256
+_RESPONSE_CACHE = ResponseCache(maxsize=LLM_CACHE_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_response_store() -> Optional[SQLiteResponseStore]:
+    """Persistent cache tier, enabled when ``settings.llm_cache_path`` is set."""
+
+    path = get_settings().llm_cache_path
+    return SQLiteResponseStore(path) if path else None
+
+
+def close_response_store() -> None:
+    """Close the SQLite connection (called on app shutdown)."""
+
+    if get_response_store.cache_info().currsize:
+        store = get_response_store()
+        if store is not None:
+            store.close()
+        get_response_store.cache_clear()
+
+
+async def _cached_response(key: str) -> Optional[str]:
+    """Look in memory first, then in the shared SQLite store."""
+
+    content = _RESPONSE_CACHE.get(key)
+    if content is None and (store := get_response_store()) is not None:
+        content = await asyncio.to_thread(store.get, key)
+        if content is not None:
+            _RESPONSE_CACHE.set(key, content)
+    return content
+
+
+async def _store_response(key: str, content: str) -> None:
+    _RESPONSE_CACHE.set(key, content)
+    if (store := get_response_store()) is not None:
+        await asyncio.to_thread(store.set, key, content)
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> AsyncAzureOpenAI:
+    """Build the Azure client once so calls share its connection pool."""
+
+    settings = get_settings()
+    return AsyncAzureOpenAI(
+        api_key=settings.azure_openai_key,
+        api_version=settings.mistral_api_version,
+        azure_endpoint=settings.azure_endpoint,
+        http_client=get_http_client(),
+    )
+
+
+async def close_llm_client() -> None:
+    """Release the shared client's connections (called on app shutdown)."""
+
+    if get_llm_client.cache_info().currsize:
+        await get_llm_client().close()
+        get_llm_client.cache_clear()
+
 
 async def chat_completion(
     prompt: str,
     system_message: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: int = 2000,
+    client: Optional[AsyncAzureOpenAI] = None,
+    cache_mode: Optional[CacheMode] = None,
+    json_mode: bool = False,
 ) -> str:
-    """Send a chat prompt to Mistral and return the assistant text."""
+    """Send a chat prompt to Mistral and return the assistant text.
+
+    ``client`` lets callers pass the app-scoped client; the shared module
+    client is used otherwise. Identical requests are answered from the
+    response cache according to ``cache_mode`` (``settings.llm_cache_mode``
+    by default). ``json_mode`` asks the model for a bare JSON object
+    (``response_format={"type": "json_object"}``).
+    """
     settings = get_settings()
+    cache_mode = cache_mode or settings.llm_cache_mode
 
-    client = AsyncAzureOpenAI(
-        api_key=settings.azure_openai_key,
-        api_version=settings.mistral_api_version,
-        azure_endpoint=settings.azure_endpoint,
+    key = cache_key(
+        prompt,
+        system_message,
+        settings.mistral_deployment_name,
+        temperature,
+        max_tokens,
+        json_mode,
     )
+    if cache_mode in READ_MODES:
+        cached = await _cached_response(key)
+        if cached is not None:
+            logger.info("Served LLM response from cache")
+            return cached
+        if cache_mode == "replay":
+            raise CacheMissError(f"No cached LLM response for key {key[:12]}")
+
+    client = client or get_llm_client()
+
+    rate_limiter = get_llm_rate_limiter()
+    if rate_limiter is not None:
+        await rate_limiter.acquire(estimate_tokens(prompt, system_message, max_tokens))
 
     messages = []
     if system_message:
@@ -39,6 +138,7 @@ async def chat_completion(
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            **({"response_format": {"type": "json_object"}} if json_mode else {}),
         )
 
         if not response.choices:
@@ -52,6 +152,8 @@ async def chat_completion(
             "Successfully generated LLM response (%d tokens)",
             response.usage.total_tokens if response.usage else 0,
         )
+        if cache_mode in WRITE_MODES:
+            await _store_response(key, content)
         return content
 
     except OpenAIError as exc:
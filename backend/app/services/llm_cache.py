@@ -0,0 +1,147 @@
+"""Exact-match cache for chat completions, keyed on everything that shapes the answer."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Generic, Literal, Optional, Tuple, TypeVar
+
+# enabled: read + write, read_only: never store, write_only: record without serving,
+# replay: raise on miss, disabled: bypass.
+CacheMode = Literal["enabled", "read_only", "write_only", "replay", "disabled"]
+V = TypeVar("V")
+
+READ_MODES = frozenset({"enabled", "read_only", "replay"})
+WRITE_MODES = frozenset({"enabled", "write_only"})
+
+
+class CacheMissError(LookupError):
+    """Raised in ``replay`` mode when a prompt has no recorded response."""
+
+
+def cache_key(
+    prompt: str,
+    system_message: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool = False,
+) -> str:
+    """SHA-256 over the request parameters (JSON-encoded so fields can't bleed together).
+
+    ``json_mode`` only joins the payload when set, so keys recorded before it
+    existed stay valid.
+    """
+
+    params = [prompt, system_message, model, temperature, max_tokens]
+    if json_mode:
+        params.append("json_object")
+    payload = json.dumps(params, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Bounded in-memory LRU of assistant responses."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response and mark it as recently used."""
+
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response, evicting the least recently used one when full."""
+
+        self._entries[key] = content
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FrequencyCache(Generic[V]):
+    """Bounded LFU: when full, evicts the least-used entry (oldest first on ties).
+
+    Suited to results where a few inputs recur many times and one-off inputs
+    should not push them out.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: Dict[str, Tuple[int, V]] = {}
+
+    def get(self, key: str) -> Optional[V]:
+        """Return the stored value and count the hit."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries[key] = (entry[0] + 1, entry[1])
+        return entry[1]
+
+    def set(self, key: str, value: V) -> None:
+        """Store a value, evicting the least frequently used one when full."""
+
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            coldest = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[coldest]
+        hits = self._entries[key][0] if key in self._entries else 0
+        self._entries[key] = (hits, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseStore:
+    """Durable response table shared by every worker (and restart) on the host.
+
+    WAL journaling lets several uvicorn workers read while one writes. Methods
+    are blocking; async callers run them through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, content: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache(key, content, created_at) VALUES (?, ?, ?)",
+                (key, content, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
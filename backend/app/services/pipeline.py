@@ -0,0 +1,89 @@
+"""Transcription → template inference with the LLM call overlapped on the STT tail."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from ..core.config import get_settings
+from .stt import stream_transcription, transcribe_audio
+from .template import infer_template
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+
+# How long the streamed transcript must stay unchanged before inference starts on it.
+SPECULATION_IDLE_SECONDS = 0.3
+
+_STREAM_DONE = object()
+
+
+async def transcribe_and_infer(
+    audio_bytes: bytes,
+    language: Optional[str] = None,
+    client: Optional[AsyncAzureOpenAI] = None,
+    on_transcript: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, str, Dict[str, str]]:
+    """Return ``(transcript, template, fields)`` for an uploaded recording.
+
+    With ``settings.stt_streaming`` the transcript is streamed; once it has not grown
+    for ``SPECULATION_IDLE_SECONDS`` template inference starts on the partial text.
+    That result is kept if the final transcript matches, otherwise it is cancelled
+    and inference is re-run on the final text.
+
+    ``on_transcript`` is called with the final transcript as soon as STT finishes,
+    before waiting on the extraction, so callers can publish it early.
+    """
+
+    if not get_settings().stt_streaming:
+        text = await transcribe_audio(audio_bytes, language)
+        if on_transcript is not None:
+            on_transcript(text)
+        template, fields = await infer_template(text, client=client)
+        return text, template, fields
+
+    updates: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for partial in stream_transcription(audio_bytes, language):
+                updates.put_nowait(partial)
+        finally:
+            updates.put_nowait(_STREAM_DONE)
+
+    pump_task = asyncio.create_task(pump())
+    text = ""
+    speculative_text: Optional[str] = None
+    speculative_task: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            timeout = SPECULATION_IDLE_SECONDS if text and speculative_task is None else None
+            try:
+                update = await asyncio.wait_for(updates.get(), timeout)
+            except asyncio.TimeoutError:
+                speculative_text = text
+                speculative_task = asyncio.create_task(infer_template(text, client=client))
+                continue
+
+            if update is _STREAM_DONE:
+                break
+            text = update
+            if speculative_task is not None and speculative_text != text:
+                speculative_task.cancel()
+                speculative_task = None
+
+        await pump_task  # surfaces STT errors
+    except BaseException:
+        pump_task.cancel()
+        if speculative_task is not None:
+            speculative_task.cancel()
+        raise
+
+    if on_transcript is not None:
+        on_transcript(text)
+    if speculative_task is not None and speculative_text == text:
+        template, fields = await speculative_task
+    else:
+        template, fields = await infer_template(text, client=client)
+    return text, template, fields
@@ -0,0 +1,92 @@
+"""Token-bucket gates that keep Azure calls under the deployment's RPM/TPM quotas."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Optional
+
+from ..core.config import get_settings
+
+
+class TokenBucket:
+    """Async token bucket over requests-per-minute and, optionally, tokens-per-minute.
+
+    Both buckets start full and refill continuously; ``acquire`` waits until one
+    request slot and the estimated token budget are available. A limit of 0
+    disables that dimension.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = 0) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed_minutes * self.requests_per_minute,
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed_minutes * self.tokens_per_minute,
+        )
+
+    def _wait_seconds(self, tokens: int) -> float:
+        """How long until the request (and token) budget covers this call."""
+
+        wait = 0.0
+        if self.requests_per_minute and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.requests_per_minute
+        if self.tokens_per_minute and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait for capacity, then spend one request and ``tokens`` tokens."""
+
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)  # a huge call must still fit once
+
+        async with self._lock:
+            self._refill()
+            while wait := self._wait_seconds(tokens):
+                await asyncio.sleep(wait)
+                self._refill()
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+
+
+def estimate_tokens(prompt: str, system_message: Optional[str], max_tokens: int) -> int:
+    """Rough upper bound of a chat call's token usage (~4 characters per token)."""
+
+    return (len(prompt) + len(system_message or "")) // 4 + max_tokens
+
+
+@lru_cache(maxsize=1)
+def get_llm_rate_limiter() -> Optional[TokenBucket]:
+    """Shared LLM bucket, or None when no LLM limit is configured."""
+
+    settings = get_settings()
+    if not (settings.llm_requests_per_minute or settings.llm_tokens_per_minute):
+        return None
+    return TokenBucket(settings.llm_requests_per_minute, settings.llm_tokens_per_minute)
+
+
+@lru_cache(maxsize=1)
+def get_stt_rate_limiter() -> Optional[TokenBucket]:
+    """Shared STT bucket, or None when no STT limit is configured."""
+
+    settings = get_settings()
+    if not settings.stt_requests_per_minute:
+        return None
+    return TokenBucket(settings.stt_requests_per_minute)
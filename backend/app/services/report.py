@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, Optional
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 TEMPLATE_HEADERS = {
     "probleme_decouverte": "RAPPORT D'INCIDENT - Problème Découvert",
@@ -12,54 +13,68 @@ TEMPLATE_HEADERS = {
     "rapport_generique": "RAPPORT DE CHANTIER - Générique",
 }
 
+SEP_EQ = "=" * 60
+SEP_DASH = "─" * 60
+EMPTY_FIELD_VALUE = "Non renseigné"
+
+# Static blocks are pre-joined once; generate_report only formats what varies.
+DETAILS_HEADER = "\n".join(("", SEP_DASH, "DÉTAILS DU RAPPORT", SEP_DASH, ""))
+TRANSCRIPT_HEADER = "\n".join(("", SEP_DASH, "TRANSCRIPTION AUDIO", SEP_DASH, ""))
+FOOTER = "\n".join(
+    (
+        "",
+        SEP_DASH,
+        "Rapport généré automatiquement par Site Reporter MVP",
+        "Note: La génération PDF sera ajoutée prochainement",
+        SEP_DASH,
+    )
+)
+
+
+TIMESTAMP_FORMAT = "%d/%m/%Y à %H:%M"
+_last_timestamp: Tuple[int, str] = (-1, "")
+
+
+def _report_timestamp() -> str:
+    """Minute-precision "generated at" stamp, formatted at most once per minute."""
+
+    global _last_timestamp
+
+    now = int(time.time())
+    minute = now - now % 60
+    if minute != _last_timestamp[0]:
+        _last_timestamp = (minute, time.strftime(TIMESTAMP_FORMAT, time.localtime(now)))
+    return _last_timestamp[1]
+
+
+def _build_prefix(header: str) -> str:
+    """Title block shown above the timestamp."""
+
+    return f"{SEP_EQ}\n{header}\n{SEP_EQ}\n"
+
+
+REPORT_PREFIX: Dict[str, str] = {
+    template_type: _build_prefix(header) for template_type, header in TEMPLATE_HEADERS.items()
+}
+
+
+@lru_cache(maxsize=64)
+def _unknown_report_prefix(template_type: str) -> str:
+    """Title block for template types without a dedicated header."""
+
+    return _build_prefix(f"RAPPORT DE CHANTIER - {template_type.upper()}")
+
 
 def generate_report(
     template_type: str, fields: Dict[str, str], transcript: Optional[str] = None
 ) -> str:
     """Assemble a French report body from the selected template and data."""
 
-    header = TEMPLATE_HEADERS.get(template_type, f"RAPPORT DE CHANTIER - {template_type.upper()}")
+    prefix = REPORT_PREFIX.get(template_type) or _unknown_report_prefix(template_type)
 
-    now = datetime.now()
-    timestamp = now.strftime("%d/%m/%Y à %H:%M")
+    timestamp = _report_timestamp()
 
-    lines = [
-        "=" * 60,
-        header,
-        "=" * 60,
-        f"Généré le: {timestamp}",
-        "",
-        "─" * 60,
-        "DÉTAILS DU RAPPORT",
-        "─" * 60,
-        "",
-    ]
-
-    for key, value in fields.items():
-        field_value = value if value else "Non renseigné"
-        lines.append(f"▪ {key}: {field_value}")
-
-    if transcript:
-        lines.extend(
-            [
-                "",
-                "─" * 60,
-                "TRANSCRIPTION AUDIO",
-                "─" * 60,
-                "",
-                f"{transcript}",
-                "",
-            ]
-        )
-
-    lines.extend(
-        [
-            "",
-            "─" * 60,
-            "Rapport généré automatiquement par Site Reporter MVP",
-            "Note: La génération PDF sera ajoutée prochainement",
-            "─" * 60,
-        ]
-    )
+    body = "".join(f"\n▪ {key}: {value or EMPTY_FIELD_VALUE}" for key, value in fields.items())
+    transcript_block = f"\n{TRANSCRIPT_HEADER}\n{transcript}\n" if transcript else ""
 
-    return "\n".join(lines)
+    return f"{prefix}Généré le: {timestamp}\n{DETAILS_HEADER}{body}{transcript_block}\n{FOOTER}"
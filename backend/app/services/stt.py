@@ -2,54 +2,155 @@
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import binascii
+import hashlib
 import io
 import logging
-from typing import Optional
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from openai import AsyncAzureOpenAI
 from openai import OpenAIError
 
+try:  # SIMD-accelerated decoder (AVX2/AVX-512/NEON) when the wheel is installed
+    from pybase64 import b64decode
+except ImportError:  # pragma: no cover - plain CPython fallback
+    from base64 import b64decode
+
 from ..core.config import get_settings
+from .http_client import get_http_client
+from .llm_cache import ResponseCache
+from .rate_limit import get_stt_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 STT_TEMPERATURE = 0.0  # Keep transcription deterministic
 
+# Retries and duplicate submissions of the same clip are answered from memory.
+STT_CACHE_SIZE = 128
+_TRANSCRIPT_CACHE = ResponseCache(maxsize=STT_CACHE_SIZE)
 
-async def transcribe_audio(audio_b64: str, language: Optional[str] = None) -> str:
-    """Send audio to Azure STT and return text.
+# The STT endpoint picks the decoder from the file extension, so name the upload after
+# its container (the UI sends Ogg/Opus or FLAC when it can compress, WAV otherwise).
+AUDIO_FILENAMES = ((b"OggS", "recording.ogg"), (b"fLaC", "recording.flac"))
+DEFAULT_AUDIO_FILENAME = "recording.wav"
 
-    Args:
-        audio_b64: Base64-encoded WAV bytes from the frontend recorder.
-        language: Optional BCP-47 language tag (defaults to settings.default_language).
 
-    Returns:
-        Plain transcript text produced by the `stt_deployment_name` model at the
-        fixed temperature defined by ``STT_TEMPERATURE``.
-    """
-    audio_bytes = base64.b64decode(audio_b64)
-    settings = get_settings()
+def _b64decode(audio_b64: str) -> bytes:
+    """Decode standard or URL-safe base64, tolerating stripped padding."""
+
+    data = audio_b64.strip()
+    altchars = b"-_" if ("-" in data or "_" in data) else None
+    data += "=" * (-len(data) % 4)
+    return b64decode(data, altchars=altchars)
+
+
+def audio_filename(audio_bytes: bytes) -> str:
+    """Upload name matching the audio's container, from its magic bytes."""
+
+    for magic, filename in AUDIO_FILENAMES:
+        if audio_bytes.startswith(magic):
+            return filename
+    return DEFAULT_AUDIO_FILENAME
+
+
+def audio_cache_key(audio_bytes: bytes, model: str, language: str) -> str:
+    """Fingerprint the full audio content together with what shapes the transcript."""
+
+    digest = hashlib.blake2b(audio_bytes, digest_size=16)
+    digest.update(f"|{len(audio_bytes)}|{model}|{language}".encode("utf-8"))
+    return digest.hexdigest()
 
-    if language is None:
-        language = settings.default_language
 
-    client = AsyncAzureOpenAI(
+@lru_cache(maxsize=1)
+def get_stt_client() -> AsyncAzureOpenAI:
+    """Build the transcription client once so uploads reuse its warm connections."""
+
+    settings = get_settings()
+    return AsyncAzureOpenAI(
         api_key=settings.azure_openai_key,
         api_version=settings.stt_api_version,
         azure_endpoint=settings.azure_endpoint,
+        http_client=get_http_client(),
     )
 
+
+async def close_stt_client() -> None:
+    """Release the shared client's connections (called on app shutdown)."""
+
+    if get_stt_client.cache_info().currsize:
+        await get_stt_client().close()
+        get_stt_client.cache_clear()
+
+
+async def decode_audio(audio_b64: str) -> bytes:
+    """Decode the uploaded audio in a worker thread so big payloads don't stall the loop.
+
+    Raises:
+        ValueError: when the payload is not valid base64.
+    """
+
+    try:
+        return await asyncio.to_thread(_b64decode, audio_b64)
+    except binascii.Error as exc:
+        raise ValueError(f"Invalid base64 audio payload: {exc}") from exc
+
+
+async def _prepare_request(
+    audio_bytes: bytes, language: Optional[str]
+) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    """Shared front half of both transcription calls.
+
+    Returns the cache key, the cached transcript if there is one, and otherwise
+    the ``transcriptions.create`` arguments (after waiting on the rate limiter).
+    """
+    settings = get_settings()
+    model = settings.stt_deployment_name
+
+    if language is None:
+        language = settings.default_language
+
+    key = await asyncio.to_thread(audio_cache_key, audio_bytes, model, language)
+    cached = _TRANSCRIPT_CACHE.get(key)
+    if cached is not None:
+        logger.info("Transcript cache hit (%d bytes)", len(audio_bytes))
+        return key, cached, {}
+
+    rate_limiter = get_stt_rate_limiter()
+    if rate_limiter is not None:
+        await rate_limiter.acquire()
+
     audio_file = io.BytesIO(audio_bytes)
-    audio_file.name = "recording.wav"
+    audio_file.name = audio_filename(audio_bytes)
+
+    request = {
+        "model": model,
+        "file": audio_file,
+        "language": language,
+        "temperature": STT_TEMPERATURE,
+    }
+    return key, None, request
+
+
+async def transcribe_audio(audio_bytes: bytes, language: Optional[str] = None) -> str:
+    """Send audio to Azure STT and return text.
+
+    Args:
+        audio_bytes: Raw WAV, Ogg/Opus or FLAC bytes (see ``decode_audio`` for base64).
+        language: Optional BCP-47 language tag (defaults to settings.default_language).
+
+    Returns:
+        Plain transcript text produced by the `stt_deployment_name` model at the
+        fixed temperature defined by ``STT_TEMPERATURE``.
+    """
+    key, cached, request = await _prepare_request(audio_bytes, language)
+    if cached is not None:
+        return cached
 
     try:
-        response = await client.audio.transcriptions.create(
-            model=settings.stt_deployment_name,
-            file=audio_file,
-            language=language,
-            temperature=STT_TEMPERATURE,
-        )
+        response = await get_stt_client().audio.transcriptions.create(**request)
 
         text = getattr(response, "text", None)
         if not text and isinstance(response, dict):
@@ -59,6 +160,7 @@ async def transcribe_audio(audio_b64: str, language: Optional[str] = None) -> st
             raise ValueError("Transcription response did not contain text")
 
         logger.info("Successfully transcribed audio (%d bytes)", len(audio_bytes))
+        _TRANSCRIPT_CACHE.set(key, text)
         return text
 
     except OpenAIError as exc:
@@ -67,3 +169,42 @@ async def transcribe_audio(audio_b64: str, language: Optional[str] = None) -> st
     except Exception as exc:
         logger.error("Unexpected error during transcription: %s", exc)
         raise
+
+
+async def stream_transcription(
+    audio_bytes: bytes, language: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Yield the transcript as it grows while Azure streams it back.
+
+    Each value is the full text so far; the last one is the final transcript. A
+    cached transcript is yielded once without calling Azure.
+    """
+    key, cached, request = await _prepare_request(audio_bytes, language)
+    if cached is not None:
+        yield cached
+        return
+
+    try:
+        stream = await get_stt_client().audio.transcriptions.create(**request, stream=True)
+
+        text = ""
+        async for event in stream:
+            if event.type == "transcript.text.delta" and event.delta:
+                text += event.delta
+                yield text
+            elif event.type == "transcript.text.done" and event.text != text:
+                text = event.text
+                yield text
+
+        if not text:
+            raise ValueError("Transcription response did not contain text")
+
+        logger.info("Successfully transcribed audio (%d bytes, streamed)", len(audio_bytes))
+        _TRANSCRIPT_CACHE.set(key, text)
+
+    except OpenAIError as exc:
+        logger.error("Azure OpenAI transcription failed: %s", exc)
+        raise
+    except Exception as exc:
+        logger.error("Unexpected error during transcription: %s", exc)
+        raise
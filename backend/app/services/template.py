@@ -2,41 +2,149 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import re
+import time
+import unicodedata
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple
 
+import orjson
+from openai import OpenAIError
+
+from ..core.config import get_settings
 from .llm import chat_completion
+from .llm_cache import READ_MODES, WRITE_MODES, FrequencyCache
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+
+logger = logging.getLogger(__name__)
 
 INCIDENT_TEMPLATE_TYPE = "probleme_decouverte"
-INCIDENT_FIELD_SCHEMA: Dict[str, str] = {
-    "Nom du chantier": "nom du chantier ou projet si mentionné",
-    "Nom de l'incident": "titre ou nom court de l'incident",
-    "Emetteur du signalement": "nom de la personne qui signale l'incident",
-    "Date de découverte": "date de découverte de l'incident (format JJ/MM/AAAA)",
-    "Heure de découverte": "heure de découverte de l'incident (format HH:MM)",
-    "Adresse": "adresse ou localisation précise de l'incident",
-    "Nature de l'incident": "type ou catégorie de l'incident (électricité, plomberie, structure, etc.)",
-    "Description de l'incident": "description détaillée de l'incident observé",
-    "Risques identifiés": "risques potentiels liés à cet incident",
-    "Actions à réaliser": "actions correctives ou mesures à prendre",
-    "Niveau d'urgence": "niveau d'urgence (Faible/Moyen/Élevé/Critique)",
-    "Personnes prévenues": "liste des personnes ou services informés",
-}
+INCIDENT_FIELD_SCHEMA: Mapping[str, str] = MappingProxyType(
+    {
+        "Nom du chantier": "nom du chantier ou projet si mentionné",
+        "Nom de l'incident": "titre ou nom court de l'incident",
+        "Emetteur du signalement": "nom de la personne qui signale l'incident",
+        "Date de découverte": "date de découverte de l'incident (format JJ/MM/AAAA)",
+        "Heure de découverte": "heure de découverte de l'incident (format HH:MM)",
+        "Adresse": "adresse ou localisation précise de l'incident",
+        "Nature de l'incident": "type ou catégorie de l'incident (électricité, plomberie, structure, etc.)",
+        "Description de l'incident": "description détaillée de l'incident observé",
+        "Risques identifiés": "risques potentiels liés à cet incident",
+        "Actions à réaliser": "actions correctives ou mesures à prendre",
+        "Niveau d'urgence": "niveau d'urgence (Faible/Moyen/Élevé/Critique)",
+        "Personnes prévenues": "liste des personnes ou services informés",
+    }
+)
+
+# Every schema field blanked; copied as the starting point for each extraction.
+EMPTY_FIELDS: Mapping[str, str] = MappingProxyType(dict.fromkeys(INCIDENT_FIELD_SCHEMA, ""))
+
+# Same text as json.dumps(..., ensure_ascii=False, indent=2).
+INCIDENT_SCHEMA_JSON = orjson.dumps(
+    dict(INCIDENT_FIELD_SCHEMA), option=orjson.OPT_INDENT_2
+).decode()
+
+# Everything that does not depend on the transcript lives in the system message, so
+# every extraction request starts with the same byte-identical prefix and the
+# provider's automatic prefix caching can reuse it. Only the user message varies.
+SYSTEM_PROMPT = f"""Tu es un assistant IA spécialisé dans l'extraction d'informations de rapports de chantier en français.
+Tu dois extraire les informations pertinentes d'une transcription audio et les structurer selon un schéma donné.
 
+Règles importantes:
+- Extrais uniquement les informations explicitement mentionnées dans la transcription
+- Si une information n'est pas mentionnée, laisse le champ vide
+- Pour les dates, utilise le format JJ/MM/AAAA
+- Sois précis et factuel
+- Réponds UNIQUEMENT avec un objet JSON valide, sans texte additionnel
 
-def _extract_year_from_transcript(transcript: str) -> Optional[int]:
-    """Return the latest 4-digit year mentioned in the transcript, if any."""
+Schéma des champs à extraire:
+{INCIDENT_SCHEMA_JSON}
+
+Extrais les informations de la transcription et retourne un objet JSON avec ces champs.
+Pour chaque champ, extrais la valeur appropriée de la transcription.
+Si une valeur n'est pas mentionnée, mets une chaîne vide "".
+
+Réponds UNIQUEMENT avec l'objet JSON, sans markdown ni texte additionnel."""
+
+USER_PROMPT_TEMPLATE = """Transcription audio:
+{transcript}"""
+
+# Changes whenever the prompts or schema change, so stale extractions never match.
+SCHEMA_VERSION = hashlib.blake2b(
+    f"{SYSTEM_PROMPT}\0{USER_PROMPT_TEMPLATE}\0{INCIDENT_SCHEMA_JSON}".encode("utf-8"),
+    digest_size=8,
+).hexdigest()
+
+# 12 short French values fit well under this; long free-text fields (description,
+# risks, actions) are why it is not lower — a truncated reply loses every field.
+EXTRACTION_MAX_TOKENS = 600
+
+# Parsed LLM extractions (before date/default filling, which depends on the clock).
+EXTRACTION_CACHE_SIZE = 1024
+_EXTRACTION_CACHE: FrequencyCache[Dict[str, str]] = FrequencyCache(maxsize=EXTRACTION_CACHE_SIZE)
+
+_JSON_DECODER = json.JSONDecoder()
+_YEAR_RE = re.compile(r"\b(20\d{2})\b")
+
+DATE_FORMAT = "%d/%m/%Y"
+TIME_FORMAT = "%H:%M"
+_last_now: Tuple[int, datetime, str, str] = (-1, datetime.min, "", "")
+
+
+def _now_strings() -> Tuple[datetime, str, str]:
+    """Current time with its date/time field strings, formatted at most once per second."""
+
+    global _last_now
+
+    now = int(time.time())
+    if now != _last_now[0]:
+        current = datetime.fromtimestamp(now)
+        _last_now = (now, current, current.strftime(DATE_FORMAT), current.strftime(TIME_FORMAT))
+    return _last_now[1], _last_now[2], _last_now[3]
+
+
+def _extraction_key(transcript: str) -> str:
+    """Hash of the transcript tagged with the prompt/schema version.
 
-    matches = re.findall(r"\b(20\d{2})\b", transcript)
-    if not matches:
-        return None
+    The text is NFC-normalized with whitespace runs collapsed first, so transcripts
+    that differ only in spacing or Unicode composition share an entry.
+    """
 
+    normalized = unicodedata.normalize("NFC", " ".join(transcript.split()))
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{SCHEMA_VERSION}:{digest}"
+
+
+def _parse_llm_json(response: str) -> Dict[str, str]:
+    """Decode the first JSON object in the reply, ignoring fences or stray prose around it.
+
+    The common case (one object, possibly fenced) goes through orjson; replies with
+    trailing braces or several objects fall back to the stdlib incremental decoder.
+    """
+
+    start = response.find("{")
+    if start == -1:
+        raise ValueError("LLM response does not contain a JSON object")
     try:
-        return int(matches[-1])
-    except ValueError:
-        return None
+        return orjson.loads(response[start : response.rindex("}") + 1])
+    except orjson.JSONDecodeError:
+        fields, _ = _JSON_DECODER.raw_decode(response, start)
+        return fields
+
+
+def _extract_year_from_transcript(transcript: str) -> Optional[int]:
+    """Return the latest 4-digit year mentioned in the transcript, if any."""
+
+    last = None
+    for match in _YEAR_RE.finditer(transcript):
+        last = match
+    return int(last.group(1)) if last else None
 
 
 def _normalize_date_field(transcript: str, date_str: str, now: datetime) -> str:
@@ -62,68 +170,49 @@ def _normalize_date_field(transcript: str, date_str: str, now: datetime) -> str:
             normalized = datetime(target_year, month, day)
         except ValueError:
             return date_str
-        return normalized.strftime("%d/%m/%Y")
+        return normalized.strftime(DATE_FORMAT)
 
     return date_str
 
 
-async def infer_template(transcript: str) -> Tuple[str, Dict[str, str]]:
+async def infer_template(
+    transcript: str, client: Optional[AsyncAzureOpenAI] = None
+) -> Tuple[str, Dict[str, str]]:
     """Fill the single incident template with values extracted from the transcript."""
 
     template = INCIDENT_TEMPLATE_TYPE
-    field_schema = INCIDENT_FIELD_SCHEMA.copy()
 
-    system_prompt = """Tu es un assistant IA spécialisé dans l'extraction d'informations de rapports de chantier en français.
-Tu dois extraire les informations pertinentes d'une transcription audio et les structurer selon un schéma donné.
+    cache_mode = get_settings().llm_cache_mode
+    key = _extraction_key(transcript)
+    cached = _EXTRACTION_CACHE.get(key) if cache_mode in READ_MODES else None
 
-Règles importantes:
-- Extrais uniquement les informations explicitement mentionnées dans la transcription
-- Si une information n'est pas mentionnée, laisse le champ vide
-- Pour les dates, utilise le format JJ/MM/AAAA
-- Sois précis et factuel
-- Réponds UNIQUEMENT avec un objet JSON valide, sans texte additionnel"""
-
-    user_prompt = f"""Transcription audio:
-{transcript}
-
-Schéma des champs à extraire:
-{json.dumps(field_schema, ensure_ascii=False, indent=2)}
-
-Extrais les informations de la transcription et retourne un objet JSON avec ces champs.
-Pour chaque champ, extrais la valeur appropriée de la transcription.
-Si une valeur n'est pas mentionnée, mets une chaîne vide "".
-
-Réponds UNIQUEMENT avec l'objet JSON, sans markdown ni texte additionnel."""
+    if cached is not None:
+        fields = dict(cached)
+    else:
+        user_prompt = USER_PROMPT_TEMPLATE.format(transcript=transcript)
 
-    try:
-        llm_response = await chat_completion(
-            prompt=user_prompt,
-            system_message=system_prompt,
-            temperature=0.1,  # keep answers grounded
-            max_tokens=1000,
-        )
-
-        cleaned_response = llm_response.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.startswith("```"):
-            cleaned_response = cleaned_response[3:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
+        try:
+            llm_response = await chat_completion(
+                prompt=user_prompt,
+                system_message=SYSTEM_PROMPT,
+                temperature=0.1,  # keep answers grounded
+                max_tokens=EXTRACTION_MAX_TOKENS,
+                client=client,
+                json_mode=get_settings().llm_json_mode,
+            )
 
-        fields = json.loads(cleaned_response)
+            # Schema fields first (blank when missing), then anything extra the LLM added.
+            fields = {**EMPTY_FIELDS, **_parse_llm_json(llm_response)}
 
-        for field_name in field_schema.keys():
-            if field_name not in fields:
-                fields[field_name] = ""
+            if cache_mode in WRITE_MODES:
+                _EXTRACTION_CACHE.set(key, dict(fields))
 
-    except Exception as e:
-        print(f"LLM extraction failed: {e}, using empty fields")
-        fields = {field_name: "" for field_name in field_schema.keys()}
+        except (OpenAIError, ValueError):  # ValueError covers JSON decode errors
+            logger.exception("LLM extraction failed, using empty fields")
+            fields = dict(EMPTY_FIELDS)
 
     # Auto-fill date and time if not mentioned (for all templates)
-    now = datetime.now()
+    now, today, current_time = _now_strings()
 
     if "Date de découverte" in fields and fields["Date de découverte"]:
         fields["Date de découverte"] = _normalize_date_field(
@@ -134,10 +223,10 @@ Réponds UNIQUEMENT avec l'objet JSON, sans markdown ni texte additionnel."""
         fields["Date"] = _normalize_date_field(transcript, fields["Date"], now)
 
     if "Date de découverte" in fields and not fields["Date de découverte"]:
-        fields["Date de découverte"] = now.strftime("%d/%m/%Y")
+        fields["Date de découverte"] = today
 
     if "Heure de découverte" in fields and not fields["Heure de découverte"]:
-        fields["Heure de découverte"] = now.strftime("%H:%M")
+        fields["Heure de découverte"] = current_time
 
     if not fields.get("Nom du chantier"):
         fields["Nom du chantier"] = "Y154.2433150000 – BEX Lucien Faure / Bd Daney"
@@ -155,9 +244,9 @@ Réponds UNIQUEMENT avec l'objet JSON, sans markdown ni texte additionnel."""
         fields["Personnes prévenues"] = "Arthur Brunet"
 
     if "Date" in fields and not fields["Date"]:
-        fields["Date"] = now.strftime("%d/%m/%Y")
+        fields["Date"] = today
 
     if "Heure" in fields and not fields["Heure"]:
-        fields["Heure"] = now.strftime("%H:%M")
+        fields["Heure"] = current_time
 
     return template, fields
@@ -0,0 +1,34 @@
+"""Unit tests for the pure text helpers in app.services.docx_generator."""
+
+from __future__ import annotations
+
+from app.services.docx_generator import _match_row, _replace_generic_placeholders
+
+FIELDS = {"Adresse": "91 rue Lucien Faure", "Nom du chantier": "BEX"}
+
+
+class TestReplaceGenericPlaceholders:
+    def test_replaces_brace_and_bracket_tokens(self) -> None:
+        text = "{Adresse} / [Nom du chantier]"
+        assert _replace_generic_placeholders(text, FIELDS) == "91 rue Lucien Faure / BEX"
+
+    def test_missing_value_becomes_empty(self) -> None:
+        assert _replace_generic_placeholders("Urgence: {Niveau d'urgence}", FIELDS) == "Urgence: "
+
+    def test_leaves_unknown_and_mismatched_tokens(self) -> None:
+        text = "[Inconnu] {Adresse]"
+        assert _replace_generic_placeholders(text, FIELDS) == text
+
+
+class TestMatchRow:
+    def test_exact_label(self) -> None:
+        assert _match_row("adresse", "Adresse :", "")[0] == "Adresse"
+
+    def test_label_within_longer_text(self) -> None:
+        assert _match_row("adresse du site", "Adresse du site", "")[0] == "Adresse"
+
+    def test_placeholder_takes_precedence_over_label(self) -> None:
+        assert _match_row("adresse", "Adresse", "{Nom du chantier}")[0] == "Nom du chantier"
+
+    def test_unmapped_row(self) -> None:
+        assert _match_row("signature", "Signature", "") is None
@@ -0,0 +1,175 @@
+"""Unit tests for the chat completion response cache (no Azure access)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import llm
+from app.services.llm_cache import (
+    CacheMissError,
+    FrequencyCache,
+    ResponseCache,
+    SQLiteResponseStore,
+    cache_key,
+)
+from app.services.rate_limit import get_llm_rate_limiter
+
+
+class FakeClient:
+    """Stands in for AsyncAzureOpenAI and counts completion calls."""
+
+    def __init__(self, content: str = "réponse") -> None:
+        self.calls = 0
+        self.last_kwargs: dict = {}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._content = content
+
+    async def _create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls += 1
+        self.last_kwargs = kwargs
+        message = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+    get_settings.cache_clear()
+    get_llm_rate_limiter.cache_clear()
+    llm._RESPONSE_CACHE.clear()
+    yield
+    llm.close_response_store()
+    get_settings.cache_clear()
+    get_llm_rate_limiter.cache_clear()
+
+
+class TestCacheKey:
+    def test_stable_for_same_request(self) -> None:
+        assert cache_key("p", "s", "m", 0.1, 10) == cache_key("p", "s", "m", 0.1, 10)
+
+    def test_changes_with_any_parameter(self) -> None:
+        base = cache_key("p", "s", "m", 0.1, 10)
+        assert base != cache_key("p", None, "m", 0.1, 10)
+        assert base != cache_key("p", "s", "m", 0.2, 10)
+        assert base != cache_key("p", "s", "m", 0.1, 11)
+
+    def test_json_mode_keeps_legacy_keys_and_adds_its_own(self) -> None:
+        base = cache_key("p", "s", "m", 0.1, 10)
+        assert cache_key("p", "s", "m", 0.1, 10, json_mode=False) == base
+        assert cache_key("p", "s", "m", 0.1, 10, json_mode=True) != base
+
+    def test_fields_do_not_bleed_together(self) -> None:
+        assert cache_key("a|b", "c", "m", 0.1, 10) != cache_key("a", "b|c", "m", 0.1, 10)
+
+
+class TestResponseCache:
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert len(cache) == 2
+
+
+class TestFrequencyCache:
+    def test_evicts_least_frequently_used(self) -> None:
+        cache: FrequencyCache[str] = FrequencyCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert len(cache) == 2
+
+    def test_ties_evict_oldest(self) -> None:
+        cache: FrequencyCache[str] = FrequencyCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.set("c", "3")
+        assert cache.get("a") is None
+        assert cache.get("b") == "2"
+
+
+class TestSQLiteResponseStore:
+    def test_round_trip_survives_reopen(self, tmp_path: Path) -> None:
+        store = SQLiteResponseStore(tmp_path / "cache.sqlite")
+        store.set("k", "réponse")
+        store.close()
+        reopened = SQLiteResponseStore(tmp_path / "cache.sqlite")
+        assert reopened.get("k") == "réponse"
+        assert reopened.get("missing") is None
+        reopened.close()
+
+    def test_first_write_wins(self, tmp_path: Path) -> None:
+        store = SQLiteResponseStore(tmp_path / "cache.sqlite")
+        store.set("k", "a")
+        store.set("k", "b")
+        assert store.get("k") == "a"
+        store.close()
+
+
+class TestChatCompletionCaching:
+    def test_second_identical_call_is_served_from_cache(self) -> None:
+        client = FakeClient()
+        for _ in range(2):
+            assert asyncio.run(llm.chat_completion("p", client=client)) == "réponse"
+        assert client.calls == 1
+
+    def test_read_only_does_not_store(self) -> None:
+        client = FakeClient()
+        for _ in range(2):
+            asyncio.run(llm.chat_completion("p", client=client, cache_mode="read_only"))
+        assert client.calls == 2
+
+    def test_disabled_bypasses_existing_entries(self) -> None:
+        client = FakeClient()
+        asyncio.run(llm.chat_completion("p", client=client))
+        asyncio.run(llm.chat_completion("p", client=client, cache_mode="disabled"))
+        assert client.calls == 2
+
+    def test_json_mode_requests_a_json_object(self) -> None:
+        client = FakeClient()
+        asyncio.run(llm.chat_completion("p", client=client, json_mode=True))
+        assert client.last_kwargs["response_format"] == {"type": "json_object"}
+        asyncio.run(llm.chat_completion("q", client=client))
+        assert "response_format" not in client.last_kwargs
+
+    def test_replay_raises_on_miss(self) -> None:
+        client = FakeClient()
+        with pytest.raises(CacheMissError):
+            asyncio.run(llm.chat_completion("p", client=client, cache_mode="replay"))
+        assert client.calls == 0
+
+    def test_write_only_records_without_serving(self) -> None:
+        client = FakeClient()
+        for _ in range(2):
+            asyncio.run(llm.chat_completion("p", client=client, cache_mode="write_only"))
+        assert client.calls == 2
+        assert asyncio.run(llm.chat_completion("p", client=client, cache_mode="replay")) == (
+            "réponse"
+        )
+
+    def test_sqlite_tier_replays_after_memory_is_lost(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+        get_settings.cache_clear()
+        client = FakeClient()
+        asyncio.run(llm.chat_completion("p", client=client))
+        llm._RESPONSE_CACHE.clear()
+        assert asyncio.run(llm.chat_completion("p", client=client, cache_mode="replay")) == (
+            "réponse"
+        )
+        assert client.calls == 1
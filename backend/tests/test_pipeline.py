@@ -0,0 +1,93 @@
+"""Unit tests for the overlapped STT → template pipeline (no Azure access)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from typing import List, Tuple
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import pipeline
+from app.services.pipeline import transcribe_and_infer
+
+
+class Recorder:
+    """Fake stream + fake infer_template that log what they were asked."""
+
+    def __init__(self, script: List[Tuple[float, str]]) -> None:
+        self.script = script
+        self.inferred: List[str] = []
+
+    async def stream(self, audio_bytes: bytes, language: object = None) -> AsyncIterator[str]:
+        for delay, text in self.script:
+            await asyncio.sleep(delay)
+            yield text
+
+    async def infer(self, transcript: str, client: object = None) -> Tuple[str, dict]:
+        self.inferred.append(transcript)
+        await asyncio.sleep(0.01)
+        return "probleme_decouverte", {"Description de l'incident": transcript}
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+    get_settings.cache_clear()
+    monkeypatch.setattr(pipeline, "SPECULATION_IDLE_SECONDS", 0.02)
+    yield
+    get_settings.cache_clear()
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, recorder: Recorder) -> Tuple[str, str, dict]:
+    monkeypatch.setattr(pipeline, "stream_transcription", recorder.stream)
+    monkeypatch.setattr(pipeline, "infer_template", recorder.infer)
+    return asyncio.run(transcribe_and_infer(b"audio"))
+
+
+class TestTranscribeAndInfer:
+    def test_speculative_result_reused_when_transcript_is_final(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        recorder = Recorder([(0, "fuite"), (0, "fuite au R+2")])
+        text, _, fields = _run(monkeypatch, recorder)
+        assert text == "fuite au R+2"
+        assert fields["Description de l'incident"] == "fuite au R+2"
+        assert recorder.inferred == ["fuite au R+2"]
+
+    def test_stale_speculation_is_redone_on_final_text(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        recorder = Recorder([(0, "fuite"), (0.1, "fuite au R+2")])
+        text, _, fields = _run(monkeypatch, recorder)
+        assert text == "fuite au R+2"
+        assert fields["Description de l'incident"] == "fuite au R+2"
+        assert recorder.inferred == ["fuite", "fuite au R+2"]
+
+    def test_sequential_when_streaming_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("STT_STREAMING", "false")
+        get_settings.cache_clear()
+        recorder = Recorder([])
+
+        async def transcribe(audio_bytes: bytes, language: object = None) -> str:
+            return "panne"
+
+        monkeypatch.setattr(pipeline, "transcribe_audio", transcribe)
+        assert _run(monkeypatch, recorder)[0] == "panne"
+        assert recorder.inferred == ["panne"]
+
+    def test_final_transcript_is_published_before_inference(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        recorder = Recorder([(0, "fuite"), (0.1, "fuite au R+2")])
+        published: List[Tuple[str, int]] = []
+        monkeypatch.setattr(pipeline, "stream_transcription", recorder.stream)
+        monkeypatch.setattr(pipeline, "infer_template", recorder.infer)
+
+        def on_transcript(text: str) -> None:
+            published.append((text, len(recorder.inferred)))
+
+        asyncio.run(transcribe_and_infer(b"audio", on_transcript=on_transcript))
+        # the stale speculation ran already; the final extraction had not started yet
+        assert published == [("fuite au R+2", 1)]
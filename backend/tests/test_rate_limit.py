@@ -0,0 +1,41 @@
+"""Unit tests for the async token bucket in app.services.rate_limit."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.services.rate_limit import TokenBucket, estimate_tokens
+
+
+async def _timed_acquires(bucket: TokenBucket, count: int, tokens: int = 0) -> float:
+    start = time.monotonic()
+    for _ in range(count):
+        await bucket.acquire(tokens)
+    return time.monotonic() - start
+
+
+class TestTokenBucket:
+    def test_burst_within_capacity_does_not_wait(self) -> None:
+        bucket = TokenBucket(requests_per_minute=600)
+        assert asyncio.run(_timed_acquires(bucket, 600)) < 0.05
+
+    def test_waits_once_requests_are_spent(self) -> None:
+        bucket = TokenBucket(requests_per_minute=600)  # refills one slot every 0.1 s
+        assert asyncio.run(_timed_acquires(bucket, 601)) >= 0.09
+
+    def test_waits_for_token_budget(self) -> None:
+        bucket = TokenBucket(requests_per_minute=0, tokens_per_minute=6000)
+        assert asyncio.run(_timed_acquires(bucket, 2, tokens=3025)) >= 0.45
+
+    def test_oversized_call_is_clamped_to_capacity(self) -> None:
+        bucket = TokenBucket(requests_per_minute=0, tokens_per_minute=100)
+        assert asyncio.run(_timed_acquires(bucket, 1, tokens=10_000)) < 0.05
+
+
+class TestEstimateTokens:
+    def test_counts_prompt_system_and_completion(self) -> None:
+        assert estimate_tokens("a" * 40, "b" * 8, 100) == 112
+
+    def test_handles_missing_system_message(self) -> None:
+        assert estimate_tokens("a" * 8, None, 0) == 2
@@ -0,0 +1,71 @@
+"""Unit tests for the plaintext report builder in app.services.report."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from app.services import report
+from app.services.report import (
+    FOOTER,
+    SEP_DASH,
+    SEP_EQ,
+    TIMESTAMP_FORMAT,
+    _report_timestamp,
+    generate_report,
+)
+
+
+class TestGenerateReport:
+    def test_known_template_header(self) -> None:
+        report = generate_report("probleme_decouverte", {"Adresse": "Bordeaux"})
+        assert report.splitlines()[:3] == [
+            SEP_EQ,
+            "RAPPORT D'INCIDENT - Problème Découvert",
+            SEP_EQ,
+        ]
+
+    def test_unknown_template_falls_back_to_upper_name(self) -> None:
+        report = generate_report("visite", {"Adresse": "Bordeaux"})
+        assert report.splitlines()[1] == "RAPPORT DE CHANTIER - VISITE"
+
+    def test_empty_values_are_marked(self) -> None:
+        report = generate_report("rapport_generique", {"Adresse": "", "Urgence": "Haute"})
+        assert "▪ Adresse: Non renseigné" in report
+        assert "▪ Urgence: Haute" in report
+
+    def test_transcript_block_only_when_given(self) -> None:
+        with_transcript = generate_report("rapport_generique", {"A": "1"}, "fuite au R+2")
+        without = generate_report("rapport_generique", {"A": "1"})
+        assert "TRANSCRIPTION AUDIO" in with_transcript
+        assert "fuite au R+2" in with_transcript
+        assert "TRANSCRIPTION AUDIO" not in without
+
+    def test_layout_around_fields(self) -> None:
+        lines = generate_report("rapport_generique", {"A": "1"}, "texte").splitlines()
+        assert lines[4:9] == ["", SEP_DASH, "DÉTAILS DU RAPPORT", SEP_DASH, ""]
+        assert lines[9] == "▪ A: 1"
+        assert lines[10:16] == ["", SEP_DASH, "TRANSCRIPTION AUDIO", SEP_DASH, "", "texte"]
+
+    def test_ends_with_footer(self) -> None:
+        assert generate_report("rapport_generique", {"A": "1"}).endswith(FOOTER)
+
+
+class TestReportTimestamp:
+    def test_matches_report_format(self) -> None:
+        stamp = _report_timestamp()
+        assert datetime.strptime(stamp, TIMESTAMP_FORMAT)
+
+    def test_reused_within_the_minute(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(report.time, "time", lambda: 1_800_000_000.0)
+        first = _report_timestamp()
+        monkeypatch.setattr(report.time, "time", lambda: 1_800_000_030.0)
+        assert _report_timestamp() is first
+        monkeypatch.setattr(report.time, "time", lambda: 1_800_000_090.0)
+        assert _report_timestamp() != first
+
+    def test_rendered_in_report(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(report.time, "time", lambda: 1_800_000_000.0)
+        text = generate_report("rapport_generique", {"A": "1"})
+        assert text.splitlines()[3] == f"Généré le: {_report_timestamp()}"
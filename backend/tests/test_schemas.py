@@ -0,0 +1,41 @@
+"""Validation tests for the request payloads in app.models.schemas."""
+
+from __future__ import annotations
+
+from app.models.schemas import IncidentFields, ReportGenerationRequest
+
+
+class TestReportGenerationFields:
+    def test_incident_labels_validate_as_typed_model(self) -> None:
+        payload = ReportGenerationRequest.model_validate(
+            {"template_type": "probleme_decouverte", "fields": {"Adresse": "Bordeaux"}}
+        )
+        assert isinstance(payload.fields, IncidentFields)
+        assert payload.fields.as_dict() == {"Adresse": "Bordeaux"}
+
+    def test_custom_labels_fall_back_to_dict(self) -> None:
+        payload = ReportGenerationRequest.model_validate(
+            {"template_type": "probleme_decouverte", "fields": {"Météo": "pluie"}}
+        )
+        assert payload.fields == {"Météo": "pluie"}
+
+    def test_empty_fields_dump_to_empty_dict(self) -> None:
+        payload = ReportGenerationRequest.model_validate(
+            {"template_type": "probleme_decouverte", "fields": {}}
+        )
+        assert isinstance(payload.fields, IncidentFields)
+        assert payload.fields.as_dict() == {}
+
+    def test_labels_keep_the_order_they_were_sent_in(self) -> None:
+        fields = {"Adresse": "Bordeaux", "Nom du chantier": "Tour B", "Niveau d'urgence": "haut"}
+        payload = ReportGenerationRequest.model_validate(
+            {"template_type": "probleme_decouverte", "fields": fields}
+        )
+        assert isinstance(payload.fields, IncidentFields)
+        assert list(payload.fields.as_dict()) == list(fields)
+
+    def test_snake_case_keys_are_not_read_as_labels(self) -> None:
+        payload = ReportGenerationRequest.model_validate(
+            {"template_type": "probleme_decouverte", "fields": {"adresse": "Bordeaux"}}
+        )
+        assert payload.fields == {"adresse": "Bordeaux"}
@@ -0,0 +1,132 @@
+"""Unit tests for the audio payload decoding in app.services.stt."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import stt
+from app.services.stt import (
+    audio_cache_key,
+    audio_filename,
+    close_stt_client,
+    decode_audio,
+    get_stt_client,
+    stream_transcription,
+    transcribe_audio,
+)
+
+AUDIO = bytes(range(256)) * 4
+
+
+class TestDecodeAudio:
+    def test_standard_alphabet(self) -> None:
+        assert asyncio.run(decode_audio(base64.b64encode(AUDIO).decode())) == AUDIO
+
+    def test_urlsafe_without_padding(self) -> None:
+        encoded = base64.urlsafe_b64encode(AUDIO[:10]).decode().rstrip("=")
+        assert asyncio.run(decode_audio(encoded)) == AUDIO[:10]
+
+    def test_invalid_payload_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            asyncio.run(decode_audio("abcde"))
+
+
+class TestAudioFilename:
+    @pytest.mark.parametrize(
+        ("header", "filename"),
+        [(b"OggS\x00\x02", "recording.ogg"), (b"fLaC\x00\x00", "recording.flac")],
+    )
+    def test_compressed_containers(self, header: bytes, filename: str) -> None:
+        assert audio_filename(header + AUDIO) == filename
+
+    def test_defaults_to_wav(self) -> None:
+        assert audio_filename(b"RIFF\x00\x00\x00\x00WAVE") == "recording.wav"
+        assert audio_filename(AUDIO) == "recording.wav"
+
+
+class TestSttClient:
+    def test_client_is_shared_until_closed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+        get_settings.cache_clear()
+
+        first = get_stt_client()
+        assert get_stt_client() is first
+        asyncio.run(close_stt_client())
+        assert get_stt_client.cache_info().currsize == 0
+        get_settings.cache_clear()
+
+
+class FakeSttClient:
+    """Stands in for AsyncAzureOpenAI and counts transcription calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._create))
+
+    async def _create(self, stream: bool = False, **_: object) -> object:
+        self.calls += 1
+        if stream:
+            return self._events()
+        return SimpleNamespace(text=f"transcription {self.calls}")
+
+    async def _events(self):
+        for delta in ("fuite ", "au R+2"):
+            yield SimpleNamespace(type="transcript.text.delta", delta=delta)
+        yield SimpleNamespace(type="transcript.text.done", text="fuite au R+2")
+
+
+class TestTranscriptCache:
+    @pytest.fixture(autouse=True)
+    def _fake_client(self, monkeypatch: pytest.MonkeyPatch) -> FakeSttClient:
+        monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+        get_settings.cache_clear()
+        stt._TRANSCRIPT_CACHE.clear()
+        fake = FakeSttClient()
+        monkeypatch.setattr(stt, "get_stt_client", lambda: fake)
+        yield fake
+        stt._TRANSCRIPT_CACHE.clear()
+        get_settings.cache_clear()
+
+    def test_same_audio_is_transcribed_once(self, _fake_client: FakeSttClient) -> None:
+        first = asyncio.run(transcribe_audio(AUDIO, "fr"))
+        assert asyncio.run(transcribe_audio(AUDIO, "fr")) == first
+        assert _fake_client.calls == 1
+
+    def test_language_is_part_of_the_key(self, _fake_client: FakeSttClient) -> None:
+        asyncio.run(transcribe_audio(AUDIO, "fr"))
+        asyncio.run(transcribe_audio(AUDIO, "en"))
+        assert _fake_client.calls == 2
+
+    def test_key_covers_full_content(self) -> None:
+        assert audio_cache_key(AUDIO, "whisper", "fr") != audio_cache_key(
+            AUDIO[:-1] + b"\x00", "whisper", "fr"
+        )
+
+    def test_stream_yields_growing_text_and_fills_cache(self, _fake_client: FakeSttClient) -> None:
+        async def collect() -> list:
+            return [text async for text in stream_transcription(AUDIO, "fr")]
+
+        assert asyncio.run(collect()) == ["fuite ", "fuite au R+2"]
+        assert asyncio.run(transcribe_audio(AUDIO, "fr")) == "fuite au R+2"
+        assert _fake_client.calls == 1
+
+    def test_unexpected_stream_failure_is_logged(
+        self, _fake_client: FakeSttClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        async def broken_events():
+            yield SimpleNamespace(type="transcript.text.delta", delta="fuite ")
+            raise RuntimeError("connection reset mid-stream")
+
+        _fake_client._events = broken_events
+
+        async def collect() -> list:
+            return [text async for text in stream_transcription(AUDIO, "fr")]
+
+        with pytest.raises(RuntimeError), caplog.at_level("ERROR", logger=stt.logger.name):
+            asyncio.run(collect())
+        assert "Unexpected error during transcription" in caplog.text
@@ -6,11 +6,21 @@ or network access required.
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
 from datetime import datetime
+from typing import List
 
+import pytest
+
+from app.core.config import get_settings
+from app.services import template
 from app.services.template import (
     _extract_year_from_transcript,
     _normalize_date_field,
+    _now_strings,
+    _parse_llm_json,
+    infer_template,
 )
 
 NOW = datetime(2026, 6, 20)
@@ -42,3 +52,81 @@ class TestNormalizeDateField:
 
     def test_passes_through_malformed_date(self) -> None:
         assert _normalize_date_field("2025", "demain", NOW) == "demain"
+
+
+class TestParseLlmJson:
+    def test_plain_object(self) -> None:
+        assert _parse_llm_json('{"Adresse": "Bordeaux"}') == {"Adresse": "Bordeaux"}
+
+    def test_fenced_object(self) -> None:
+        assert _parse_llm_json('```json\n{"Adresse": "Bordeaux"}\n```') == {"Adresse": "Bordeaux"}
+
+    def test_surrounding_prose_is_ignored(self) -> None:
+        reply = 'Voici le JSON :\n{"Urgence": "Haute"}\nBonne journée.'
+        assert _parse_llm_json(reply) == {"Urgence": "Haute"}
+
+    def test_text_after_object_with_braces(self) -> None:
+        reply = '{"Adresse": "Bordeaux"}\nChamps vides: {aucun}'
+        assert _parse_llm_json(reply) == {"Adresse": "Bordeaux"}
+
+    def test_missing_object_raises(self) -> None:
+        with pytest.raises(ValueError):
+            _parse_llm_json("pas de json ici")
+
+
+class TestNowStrings:
+    def test_formats_match_field_conventions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(template.time, "time", lambda: 1_800_000_000.5)
+        now, date, hour = _now_strings()
+        assert date == now.strftime("%d/%m/%Y")
+        assert hour == now.strftime("%H:%M")
+
+    def test_reused_within_the_second(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(template.time, "time", lambda: 1_800_000_000.1)
+        first = _now_strings()
+        monkeypatch.setattr(template.time, "time", lambda: 1_800_000_000.9)
+        assert _now_strings()[1] is first[1]
+        monkeypatch.setattr(template.time, "time", lambda: 1_800_000_061.0)
+        assert _now_strings()[2] != first[2]
+
+
+class TestExtractionCache:
+    @pytest.fixture(autouse=True)
+    def _fake_llm(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[List[str]]:
+        monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+        get_settings.cache_clear()
+        template._EXTRACTION_CACHE.clear()
+        prompts: List[str] = []
+
+        async def chat_completion(prompt: str, **_: object) -> str:
+            prompts.append(prompt)
+            return '{"Adresse": "Quai des Chartrons"}'
+
+        monkeypatch.setattr(template, "chat_completion", chat_completion)
+        yield prompts
+        template._EXTRACTION_CACHE.clear()
+        get_settings.cache_clear()
+
+    def test_repeated_transcript_skips_the_llm(self, _fake_llm: List[str]) -> None:
+        asyncio.run(infer_template("fuite au R+2"))
+        second = asyncio.run(infer_template("fuite au R+2"))
+        assert second[1]["Adresse"] == "Quai des Chartrons"
+        assert len(_fake_llm) == 1
+
+    def test_spacing_and_composition_share_an_entry(self, _fake_llm: List[str]) -> None:
+        asyncio.run(infer_template("fuite  au\nR+2 à l'étage"))
+        asyncio.run(infer_template(" fuite au R+2 a\u0300 l'e\u0301tage "))
+        assert len(_fake_llm) == 1
+
+    def test_cached_fields_are_not_shared(self, _fake_llm: List[str]) -> None:
+        asyncio.run(infer_template("fuite au R+2"))[1]["Adresse"] = "modifié"
+        assert asyncio.run(infer_template("fuite au R+2"))[1]["Adresse"] == "Quai des Chartrons"
+
+    def test_disabled_cache_mode_bypasses_memo(
+        self, monkeypatch: pytest.MonkeyPatch, _fake_llm: List[str]
+    ) -> None:
+        monkeypatch.setenv("LLM_CACHE_MODE", "disabled")
+        get_settings.cache_clear()
+        asyncio.run(infer_template("fuite au R+2"))
+        asyncio.run(infer_template("fuite au R+2"))
+        assert len(_fake_llm) == 2
@@ -0,0 +1,132 @@
+"""Route-level tests for the audio endpoints with Azure calls stubbed out."""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Iterator
+from typing import List, Optional, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import workflow
+from app.core.config import get_settings
+
+AUDIO = b"RIFF\x00\x00\x00\x00WAVEfmt "
+
+
+@pytest.fixture()
+def calls(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[Tuple[bytes, Optional[str]]]]:
+    monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+    get_settings.cache_clear()
+    seen: List[Tuple[bytes, Optional[str]]] = []
+
+    async def transcribe(audio_bytes: bytes, language: Optional[str] = None) -> str:
+        seen.append((audio_bytes, language))
+        return "fuite au R+2"
+
+    monkeypatch.setattr(workflow, "transcribe_audio", transcribe)
+    yield seen
+    get_settings.cache_clear()
+
+
+@pytest.fixture()
+def client(calls: list) -> TestClient:
+    from app.main import create_app  # importing app.main builds an app, which needs settings
+
+    return TestClient(create_app())
+
+
+class TestTranscribeRoutes:
+    def test_base64_payload(self, client: TestClient, calls: list) -> None:
+        body = {"audio_b64": base64.b64encode(AUDIO).decode(), "language": "fr"}
+        response = client.post("/api/transcribe", json=body)
+        assert response.status_code == 200
+        assert response.json() == {"text": "fuite au R+2"}
+        assert calls == [(AUDIO, "fr")]
+
+    def test_multipart_upload_passes_raw_bytes(self, client: TestClient, calls: list) -> None:
+        response = client.post(
+            "/api/transcribe/upload",
+            files={"audio": ("recording.wav", AUDIO, "audio/wav")},
+            data={"language": "fr"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"text": "fuite au R+2"}
+        assert calls == [(AUDIO, "fr")]
+
+    def test_empty_upload_is_rejected(self, client: TestClient, calls: list) -> None:
+        response = client.post(
+            "/api/transcribe/upload", files={"audio": ("recording.wav", b"", "audio/wav")}
+        )
+        assert response.status_code == 400
+        assert calls == []
+
+
+class TestTranscribeTemplateRoute:
+    def test_returns_transcript_and_fields_in_one_call(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def fused(audio_bytes: bytes, language: Optional[str] = None, client: object = None):
+            return "fuite au R+2", "probleme_decouverte", {"Adresse": "Bordeaux"}
+
+        monkeypatch.setattr(workflow, "transcribe_and_infer", fused)
+        response = client.post(
+            "/api/transcribe/template/upload",
+            files={"audio": ("recording.wav", AUDIO, "audio/wav")},
+            data={"language": "fr"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "text": "fuite au R+2",
+            "template_type": "probleme_decouverte",
+            "fields": {"Adresse": "Bordeaux"},
+        }
+
+
+def _sse_events(body: str) -> List[Tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event_line, data_line = frame.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line[len("data: ") :])))
+    return events
+
+
+class TestAutoPipelineStreamRoute:
+    def _post(self, client: TestClient) -> List[Tuple[str, dict]]:
+        response = client.post(
+            "/api/pipeline/auto/upload/stream",
+            files={"audio": ("recording.wav", AUDIO, "audio/wav")},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return _sse_events(response.text)
+
+    def test_emits_each_stage_then_done(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def fused(audio_bytes, language=None, client=None, on_transcript=None):
+            on_transcript("fuite au R+2")
+            return "fuite au R+2", "probleme_decouverte", {"Adresse": "Bordeaux"}
+
+        monkeypatch.setattr(workflow, "transcribe_and_infer", fused)
+        events = self._post(client)
+        assert [name for name, _ in events] == ["transcript", "fields", "report", "done"]
+        assert events[0][1] == {"text": "fuite au R+2"}
+        assert events[1][1] == {
+            "template_type": "probleme_decouverte",
+            "fields": {"Adresse": "Bordeaux"},
+        }
+        assert "fuite au R+2" in events[2][1]["report_text"]
+
+    def test_failure_is_reported_as_an_error_event(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def failing(audio_bytes, language=None, client=None, on_transcript=None):
+            raise ValueError("Transcription response did not contain text")
+
+        monkeypatch.setattr(workflow, "transcribe_and_infer", failing)
+        events = self._post(client)
+        assert [name for name, _ in events] == ["error"]
+        assert "did not contain text" in events[0][1]["detail"]
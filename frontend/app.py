@@ -3,22 +3,46 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
 import os
-from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
+import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 
 from services.api import BackendClient
 
 BASE_DIR = Path(__file__).resolve().parent
-load_dotenv(BASE_DIR / ".env", override=False)
+ASSETS_DIR = BASE_DIR / "assets"
+LOGO_PATH = ASSETS_DIR / "vinci-logo.png"
+ENV_PATH = BASE_DIR / ".env"
 
 st.set_page_config(page_title="Rapporteur de Chantier", layout="wide", page_icon=":material/construction:")
 
-client = BackendClient()
+
+@st.cache_resource(show_spinner=False)
+def _boot_env() -> bool:
+    """Load ``frontend/.env`` (BACKEND_URL, DEMO_AUDIO_*) once per process.
+
+    Values already in the environment win. os.environ outlives reruns, so there is
+    no point parsing the file again on each one.
+    """
+
+    return load_dotenv(ENV_PATH, override=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_client() -> BackendClient:
+    """One BackendClient (and HTTP connection pool) shared by every session and rerun."""
+
+    return BackendClient()
+
+
+_boot_env()
+client = get_client()
 
 DEFAULT_LANGUAGE = "fr"
 INCIDENT_TEMPLATE_TYPE = "probleme_decouverte"
@@ -29,25 +53,98 @@ DEMO_AUDIO_ENABLED = os.getenv("DEMO_AUDIO_MODE", "false").lower() in {"1", "tru
 DEMO_AUDIO_PATH = Path(
     os.getenv(
         "DEMO_AUDIO_PATH",
-        Path(__file__).resolve().parent / "assets" / "audio_noisy.wav",
+        ASSETS_DIR / "audio_noisy.wav",
     )
 )
 
+# Static theme overrides, injected on every rerun (Streamlit drops elements a rerun
+# does not re-emit), so the string itself is only built once.
+THEME_CSS = """
+<style>
+    .main {
+        background: linear-gradient(180deg, #f1f4fb 0%, #edf1f7 40%, #edf1f7 100%);
+    }
+    section[data-testid="stSidebar"] {
+        background-color: #dfe6f2 !important;
+    }
+    section[data-testid="stSidebar"] .css-1d391kg,
+    section[data-testid="stSidebar"] p,
+    section[data-testid="stSidebar"] label {
+        color: #14213d !important;
+    }
+    .vinci-hero {
+        background: linear-gradient(135deg, #f9fbff 0%, #e8f1ff 100%);
+        border-radius: 24px;
+        padding: 1.5rem;
+        border: 1px solid rgba(0, 68, 137, 0.1);
+        margin-bottom: 1.5rem;
+    }
+    .vinci-hero__content {
+        display: flex;
+        gap: 1.5rem;
+        align-items: center;
+        flex-wrap: wrap;
+    }
+    .vinci-hero__text h1 {
+        font-size: 2.2rem;
+        margin-bottom: 0.3rem;
+        color: #0c2c5c;
+        font-weight: 700;
+    }
+    .vinci-hero__text p {
+        margin: 0;
+        color: #385076;
+        font-size: 1rem;
+    }
+    .vinci-tagline {
+        font-weight: 500;
+        letter-spacing: 0.6px;
+        text-transform: uppercase;
+        color: #1e4f93;
+    }
+    div[data-testid="stExpander"] {
+        border: 1px solid rgba(0, 68, 137, 0.15);
+        border-radius: 16px !important;
+        background-color: #f8f9fc;
+    }
+    div[data-testid="stExpander"] > details > summary {
+        font-size: 1.05rem;
+        font-weight: 600;
+        color: #0c2c5c;
+    }
+    div[data-testid="stExpander"] details[open] {
+        box-shadow: 0 6px 18px rgba(20, 33, 61, 0.08);
+    }
+    .step-hint {
+        margin-top: 0.3rem;
+        color: #4d5c7a;
+        font-size: 0.9rem;
+    }
+</style>
+"""
+
+
+# Seed values for every session. They are only ever replaced in session_state, never
+# mutated in place, so sharing the objects between sessions is safe.
+SESSION_DEFAULTS: Dict[str, object] = {
+    "mode": MANUAL_MODE,
+    "template_type": INCIDENT_TEMPLATE_TYPE,
+    "fields": {},
+    "report_text": "",
+    "audio_bytes": None,
+    TRANSCRIPT_WIDGET_KEY: "",
+}
+
 
 def init_state() -> None:
     """Seed session_state with the keys we rely on."""
 
-    defaults = {
-        "mode": MANUAL_MODE,
-        "transcript": "",
-        "template_type": INCIDENT_TEMPLATE_TYPE,
-        "fields": {},
-        "report_text": "",
-        "audio_bytes": None,
-        TRANSCRIPT_WIDGET_KEY: "",
-    }
-    for key, value in defaults.items():
-        st.session_state.setdefault(key, value)
+    missing = {key: value for key, value in SESSION_DEFAULTS.items() if key not in st.session_state}
+    if missing:
+        st.session_state.update(missing)
+    # The transcript lives only under the editor's widget key. Re-assigning it each run
+    # stops Streamlit from dropping it while the editor is not rendered (auto mode).
+    st.session_state[TRANSCRIPT_WIDGET_KEY] = st.session_state[TRANSCRIPT_WIDGET_KEY]
 
 
 def reset_workflow() -> None:
@@ -59,15 +156,13 @@ def reset_workflow() -> None:
     st.session_state["mode"] = preserved_mode
 
 
-def encode_audio(audio_bytes: bytes) -> str:
-    """Turn raw audio bytes into the base64 payload FastAPI expects."""
-
-    return base64.b64encode(audio_bytes).decode("utf-8")
-
-
-@lru_cache(maxsize=1)
+@st.cache_resource(show_spinner=False)
 def load_demo_audio_bytes() -> Optional[bytes]:
-    """Load the noisy demo audio once if demo mode is enabled."""
+    """Load the noisy demo audio once per process if demo mode is enabled.
+
+    ``st.cache_resource`` rather than ``lru_cache``: this script is re-executed on
+    every rerun, which would hand each run a brand-new, empty ``lru_cache``.
+    """
 
     if not DEMO_AUDIO_ENABLED:
         return None
@@ -99,16 +194,26 @@ def resolve_audio_bytes(raw_audio: bytes) -> bytes:
     return raw_audio
 
 
-def data_editor_rows(fields: Dict[str, str]) -> List[Dict[str, str]]:
-    """Convert our field dict into `st.data_editor` rows."""
+def data_editor_frame(fields: Dict[str, str]) -> pd.DataFrame:
+    """Convert our field dict into the two-column frame `st.data_editor` shows.
+
+    Built column-wise, so the editor gets a DataFrame as-is instead of converting a
+    list of row dicts on every rerun. Memoized on the identity of ``fields``
+    (``st.session_state["fields"]`` is only ever replaced, never mutated), so
+    unchanged reruns reuse the last frame without hashing or copying anything.
+    """
 
-    return [{"Champ": key, "Valeur": value} for key, value in fields.items()]
+    cached = st.session_state.get("_editor_frame")
+    if cached is not None and cached[0] is fields:
+        return cached[1]
+    frame = pd.DataFrame({"Champ": list(fields), "Valeur": list(fields.values())})
+    st.session_state["_editor_frame"] = (fields, frame)
+    return frame
 
 
 def set_transcript_state(value: str) -> None:
-    """Keep both transcript stores (state + widget key) aligned."""
+    """Store the transcript under the editor key (must run before the editor renders)."""
 
-    st.session_state["transcript"] = value
     st.session_state[TRANSCRIPT_WIDGET_KEY] = value
 
 
@@ -126,85 +231,26 @@ def audio_trigger_button(label: str, callback: Callable[[bytes], None]) -> None:
 def inject_theme_overrides() -> None:
     """Drop some CSS to make the Streamlit theme feel like VINCI."""
 
-    st.markdown(
-        """
-        <style>
-            .main {
-                background: linear-gradient(180deg, #f1f4fb 0%, #edf1f7 40%, #edf1f7 100%);
-            }
-            section[data-testid="stSidebar"] {
-                background-color: #dfe6f2 !important;
-            }
-            section[data-testid="stSidebar"] .css-1d391kg,
-            section[data-testid="stSidebar"] p,
-            section[data-testid="stSidebar"] label {
-                color: #14213d !important;
-            }
-            .vinci-hero {
-                background: linear-gradient(135deg, #f9fbff 0%, #e8f1ff 100%);
-                border-radius: 24px;
-                padding: 1.5rem;
-                border: 1px solid rgba(0, 68, 137, 0.1);
-                margin-bottom: 1.5rem;
-            }
-            .vinci-hero__content {
-                display: flex;
-                gap: 1.5rem;
-                align-items: center;
-                flex-wrap: wrap;
-            }
-            .vinci-hero__text h1 {
-                font-size: 2.2rem;
-                margin-bottom: 0.3rem;
-                color: #0c2c5c;
-                font-weight: 700;
-            }
-            .vinci-hero__text p {
-                margin: 0;
-                color: #385076;
-                font-size: 1rem;
-            }
-            .vinci-tagline {
-                font-weight: 500;
-                letter-spacing: 0.6px;
-                text-transform: uppercase;
-                color: #1e4f93;
-            }
-            div[data-testid="stExpander"] {
-                border: 1px solid rgba(0, 68, 137, 0.15);
-                border-radius: 16px !important;
-                background-color: #f8f9fc;
-            }
-            div[data-testid="stExpander"] > details > summary {
-                font-size: 1.05rem;
-                font-weight: 600;
-                color: #0c2c5c;
-            }
-            div[data-testid="stExpander"] details[open] {
-                box-shadow: 0 6px 18px rgba(20, 33, 61, 0.08);
-            }
-            .step-hint {
-                margin-top: 0.3rem;
-                color: #4d5c7a;
-                font-size: 0.9rem;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False, ttl=24 * 60 * 60)
+def load_logo_data_uri() -> str:
+    """Read and base64-encode the VINCI logo once; empty string when the file is missing."""
+
+    if not LOGO_PATH.exists():
+        return ""
+    encoded_logo = base64.b64encode(LOGO_PATH.read_bytes()).decode("ascii")
+    return f"data:image/png;base64,{encoded_logo}"
 
 
 def render_header() -> None:
     """Display the VINCI block with logo, title, and tagline."""
 
-    logo_path = Path(__file__).resolve().parent / "assets" / "vinci-logo.png"
+    logo_uri = load_logo_data_uri()
     logo_html = ""
-    if logo_path.exists():
-        encoded_logo = base64.b64encode(logo_path.read_bytes()).decode("utf-8")
-        logo_html = (
-            f"<img src='data:image/png;base64,{encoded_logo}' alt='VINCI Construction' "
-            "style='max-width:180px;'>"
-        )
+    if logo_uri:
+        logo_html = f"<img src='{logo_uri}' alt='VINCI Construction' style='max-width:180px;'>"
 
     st.markdown(
         f"""
@@ -223,6 +269,19 @@ def render_header() -> None:
     )
 
 
+def render_playback(audio_bytes: bytes) -> bool:
+    """Sidebar player for a recording, rendered only while the user toggles it on.
+
+    ``st.audio`` re-hashes the whole recording on every full rerun, so it is only
+    emitted on demand.
+    """
+
+    if not st.sidebar.toggle(":material/play_circle: Écouter l'enregistrement", key="show_player"):
+        return False
+    st.sidebar.audio(audio_bytes, format="audio/wav")
+    return True
+
+
 def capture_audio() -> Optional[bytes]:
     """Handle microphone capture (no file uploads for now)."""
 
@@ -237,43 +296,72 @@ def capture_audio() -> Optional[bytes]:
     if audio_input is not None:
         audio_bytes = audio_input.getvalue()
         st.sidebar.success("Enregistrement capturé.")
-        st.sidebar.audio(audio_bytes, format="audio/wav")
+        render_playback(audio_bytes)
         return audio_bytes
 
     stored_audio = st.session_state.get("audio_bytes")
     if stored_audio:
-        st.sidebar.audio(stored_audio, format="audio/wav")
-        st.sidebar.caption("Lecture du dernier enregistrement.")
+        if render_playback(stored_audio):
+            st.sidebar.caption("Lecture du dernier enregistrement.")
     else:
         st.sidebar.info(":material/info: Réalisez un enregistrement pour activer les étapes suivantes.")
     return None
 
 
+def transcript_digest(transcript: str) -> str:
+    """Short fingerprint of a transcript, used to spot unchanged re-fills."""
+
+    return hashlib.blake2b(transcript.strip().encode("utf-8"), digest_size=8).hexdigest()
+
+
+def store_inferred_fields(transcript: str, template_type: str, fields: Dict[str, str]) -> None:
+    """Save extracted fields and remember which transcript they came from."""
+
+    st.session_state["template_type"] = template_type
+    st.session_state["fields"] = fields
+    st.session_state["_last_template"] = (transcript_digest(transcript), template_type, fields)
+
+
 def handle_transcription(audio_bytes: bytes) -> None:
-    """Send the recorded audio to the backend STT endpoint."""
+    """Transcribe the recording and pre-fill the fields in a single backend call."""
 
-    encoded = encode_audio(resolve_audio_bytes(audio_bytes))
     try:
-        with st.spinner(":material/autorenew: Transcription en cours avec GPT-4o-mini..."):
-            response = client.transcribe(encoded, language=DEFAULT_LANGUAGE)
+        with st.spinner(":material/autorenew: Transcription et pré-remplissage des champs..."):
+            response = client.transcribe_and_infer(
+                resolve_audio_bytes(audio_bytes), language=DEFAULT_LANGUAGE
+            )
     except Exception as exc:  # noqa: BLE001 - surface network issues in the UI
         st.error(f":material/error: Échec de la transcription: {exc}")
         return
     set_transcript_state(response["text"])
-    st.toast("Transcription reçue.", icon=":material/done_all:")
-    populate_fields_from_transcript(auto_trigger=True)
-    st.rerun()  # refresh the UI so the transcript + champs show up
+    if response["text"].strip():
+        store_inferred_fields(
+            response["text"],
+            response.get("template_type", INCIDENT_TEMPLATE_TYPE),
+            response.get("fields", {}),
+        )
+    st.toast("Transcription reçue, champs du rapport prêts.", icon=":material/done_all:")
 
 
 def populate_fields_from_transcript(auto_trigger: bool = False) -> bool:
-    """Use the transcript to fill the single incident template."""
+    """Use the transcript to fill the single incident template.
+
+    When the transcript is the one the current extraction came from, the remembered
+    result is restored (undoing manual edits) without another LLM round-trip.
+    """
 
-    transcript = st.session_state.get("transcript", "").strip()
+    transcript = st.session_state.get(TRANSCRIPT_WIDGET_KEY, "").strip()
     if not transcript:
         if not auto_trigger:
             st.warning(":material/info: Ajoutez une transcription avant de remplir les champs.")
         return False
 
+    last = st.session_state.get("_last_template")
+    if last is not None and last[0] == transcript_digest(transcript) and last[2]:
+        st.session_state["template_type"], st.session_state["fields"] = last[1], last[2]
+        st.toast("Champs restaurés depuis la transcription.", icon=":material/table_rows:")
+        return True
+
     spinner_label = (
         ":material/table_chart: Pré-remplissage des champs du rapport..."
         if auto_trigger
@@ -287,8 +375,11 @@ def populate_fields_from_transcript(auto_trigger: bool = False) -> bool:
         st.error(f":material/error: Échec du pré-remplissage des champs: {exc}")
         return False
 
-    st.session_state["template_type"] = response.get("template_type", INCIDENT_TEMPLATE_TYPE)
-    st.session_state["fields"] = response.get("fields", {})
+    store_inferred_fields(
+        transcript,
+        response.get("template_type", INCIDENT_TEMPLATE_TYPE),
+        response.get("fields", {}),
+    )
 
     icon = ":material/table_rows:"
     message = "Champs du rapport prêts."
@@ -314,56 +405,90 @@ def handle_report_generation() -> None:
             response = client.generate_report(
                 template_type=template_type,
                 fields=fields,
-                transcript=st.session_state.get("transcript"),
+                transcript=st.session_state.get(TRANSCRIPT_WIDGET_KEY),
             )
     except Exception as exc:  # noqa: BLE001
         st.error(f":material/error: Échec de la génération: {exc}")
         return
     st.session_state["report_text"] = response["report_text"]
     st.toast("Rapport prêt pour révision.", icon=":material/done_outline:")
-    st.rerun()  # refresh the UI so the report preview appears
 
 
 def handle_auto_pipeline(audio_bytes: bytes) -> None:
-    """Let the backend run STT → template → report in one go."""
+    """Let the backend run STT → template → report, showing each stage as it lands."""
 
-    encoded = encode_audio(resolve_audio_bytes(audio_bytes))
+    status = st.status(":material/bolt: Pipeline automatique en cours...", expanded=True)
     try:
-        with st.spinner(":material/bolt: Pipeline automatique en cours..."):
-            response = client.run_auto_pipeline(encoded, language=DEFAULT_LANGUAGE)
+        with status:
+            finished = False
+            events = client.stream_auto_pipeline(resolve_audio_bytes(audio_bytes), language=DEFAULT_LANGUAGE)
+            for event, data in events:
+                if event == "transcript":
+                    set_transcript_state(data["text"])
+                    st.write(":material/done_all: Transcription reçue")
+                    st.caption(data["text"])
+                elif event == "fields":
+                    transcript = st.session_state[TRANSCRIPT_WIDGET_KEY]
+                    store_inferred_fields(transcript, data["template_type"], data["fields"])
+                    st.write(":material/table_rows: Champs du rapport extraits")
+                elif event == "report":
+                    st.session_state["report_text"] = data["report_text"]
+                    st.write(":material/article: Rapport généré")
+                elif event == "error":
+                    raise RuntimeError(data.get("detail", "erreur inconnue"))
+                elif event == "done":
+                    finished = True
+            if not finished:
+                raise RuntimeError("flux interrompu avant la fin du pipeline")
     except Exception as exc:  # noqa: BLE001
+        status.update(label=":material/error: Échec du pipeline", state="error")
         st.error(f":material/error: Échec du pipeline: {exc}")
         return
 
-    set_transcript_state(response["text"])
-    st.session_state["template_type"] = response["template_type"]
-    st.session_state["fields"] = response["fields"]
-    st.session_state["report_text"] = response["report_text"]
+    status.update(label=":material/robot_2: Rapport automatique créé", state="complete", expanded=False)
     st.toast("Rapport automatique créé.", icon=":material/robot_2:")
-    st.rerun()  # refresh the UI so each result card updates
 
 
-def rows_to_fields_dict(rows: List[Dict[str, str]]) -> Dict[str, str]:
-    """Convert edited rows back into the dict shape our API expects."""
+def frame_to_fields_dict(frame: pd.DataFrame) -> Dict[str, str]:
+    """Convert the edited frame back into the dict shape our API expects."""
 
-    return {row["Champ"]: row["Valeur"] for row in rows}
+    return dict(zip(frame["Champ"], frame["Valeur"]))
 
 
-@st.cache_data(show_spinner=False)
-def generate_docx_payload(fields: Dict[str, str], template_type: str) -> Tuple[bytes, str]:
-    """Generate the DOCX bytes and filename from the current fields."""
+def fields_digest(fields: Dict[str, str]) -> str:
+    """Short, order-independent fingerprint of the field values."""
 
-    docx_bytes = client.download_docx(fields, template_type)
-    date_str = fields.get("Date de découverte", fields.get("Date", "sans_date"))
+    encoded = json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, ttl=600, max_entries=32)
+def _docx_payload_cached(digest: str, template_type: str, _fields: Dict[str, str]) -> Tuple[bytes, str]:
+    """Cached DOCX download keyed on ``digest``; ``_fields`` is excluded from hashing."""
+
+    docx_bytes = client.download_docx(_fields, template_type)
+    date_str = _fields.get("Date de découverte", _fields.get("Date", "sans_date"))
     filename = f"rapport_incident_{date_str.replace('/', '-')}.docx"
     return docx_bytes, filename
 
 
+def generate_docx_payload(fields: Dict[str, str], template_type: str) -> Tuple[bytes, str]:
+    """Generate the DOCX bytes and filename from the current fields."""
+
+    return _docx_payload_cached(fields_digest(fields), template_type, fields)
+
+
+@st.fragment
 def show_report_preview(report_text: str) -> None:
-    """Offer a simple preview of the generated report text."""
+    """Offer a simple preview of the generated report text.
+
+    A fragment of its own (nested in the workflow), so preparing and downloading the
+    DOCX reruns only the preview. The document is generated on request, then served
+    from the digest-keyed cache while the fields stay the same.
+    """
 
     st.subheader(":material/description: Rapport Généré")
-    st.code(report_text, language="text")
+    st.text(report_text)  # plain preformatted text: no client-side highlighting pass
 
     fields = st.session_state.get("fields", {})
     template_type = st.session_state.get("template_type", INCIDENT_TEMPLATE_TYPE)
@@ -372,10 +497,20 @@ def show_report_preview(report_text: str) -> None:
         st.warning(":material/info: Aucun champ disponible pour générer le document.")
         return
 
+    # The DOCX is only fetched once asked for: sessions that never download it make
+    # no backend call and keep nothing in the cache.
+    digest = fields_digest(fields)
+    if st.session_state.get("_docx_digest") != digest:
+        if st.button(":material/description: Préparer le document", use_container_width=True):
+            st.session_state["_docx_digest"] = digest
+        else:
+            return
+
     try:
         with st.spinner(":material/download: Préparation du document Word..."):
             docx_bytes, filename = generate_docx_payload(fields, template_type)
     except Exception as exc:  # noqa: BLE001
+        st.session_state.pop("_docx_digest", None)
         st.error(f":material/error: Échec de la génération du DOCX: {exc}")
         return
 
@@ -389,71 +524,87 @@ def show_report_preview(report_text: str) -> None:
         st.toast("Document prêt au téléchargement.", icon=":material/check_circle:")
 
 
+@st.fragment
 def render_manual_workflow() -> None:
-    """Layout the three human-in-loop steps with helpful copy."""
+    """Layout the three human-in-loop steps with helpful copy.
+
+    Runs as a fragment: clicks and edits inside it only rerun this block, not the
+    header, theme and sidebar around it. Each handler runs above the widgets that
+    show its results, so they render the new state without an extra ``st.rerun()``.
+    """
 
     with st.expander(":material/mic: Étape 1 · Enregistrer et Transcrire", expanded=True):
         st.caption("Enregistrez un mémo vocal en français, puis lancez la transcription.")
         audio_trigger_button(":material/transcribe: Transcrire l'audio", handle_transcription)
 
-        new_transcript = st.text_area(
+        st.text_area(
             "Transcription (modifiable):",
             height=160,
             placeholder="La transcription apparaîtra ici après l'étape 1.",
             key=TRANSCRIPT_WIDGET_KEY,
         )
-        if new_transcript != st.session_state.get("transcript"):
-            set_transcript_state(new_transcript)
-
-    with st.expander(
-        ":material/table_chart: Étape 2 · Champs du Rapport",
-        expanded=bool(st.session_state.get("transcript")),
-    ):
-        if not st.session_state.get("transcript"):
-            st.info("Ajoutez ou éditez une transcription avant de remplir les champs.")
-        else:
-            st.caption(
-                "Les champs du template incident sont pré-remplis automatiquement à partir de la transcription. "
-                "Relancez l'extraction si vous modifiez le texte."
-            )
-            if st.button(
-                ":material/auto_graph: Re-remplir les champs depuis la transcription",
-                use_container_width=True,
-            ):
-                if populate_fields_from_transcript():
-                    st.rerun()
-
-            if st.session_state.get("fields"):
-                rows = data_editor_rows(st.session_state.get("fields", {}))
+        if st.session_state.get(TRANSCRIPT_WIDGET_KEY) and st.button(
+            ":material/auto_graph: Re-remplir les champs depuis la transcription",
+            use_container_width=True,
+        ):
+            populate_fields_from_transcript()
+
+    # Steps 2-3 share one form: table edits stay in the browser and are sent in a single
+    # rerun when the report is requested, instead of one rerun per edited cell.
+    fields = st.session_state.get("fields", {})
+    edited = None
+    with st.form("fields_form", border=False):
+        with st.expander(
+            ":material/table_chart: Étape 2 · Champs du Rapport",
+            expanded=bool(st.session_state.get(TRANSCRIPT_WIDGET_KEY)),
+        ):
+            if not st.session_state.get(TRANSCRIPT_WIDGET_KEY):
+                st.info("Ajoutez ou éditez une transcription avant de remplir les champs.")
+            elif fields:
+                st.caption(
+                    "Les champs du template incident sont pré-remplis automatiquement à partir de la transcription. "
+                    "Relancez l'extraction si vous modifiez le texte."
+                )
+                frame = data_editor_frame(fields)
                 edited = st.data_editor(
-                    rows,
+                    frame,
                     use_container_width=True,
                     num_rows="dynamic",
                     key="fields_editor",
                 )
-                st.session_state["fields"] = rows_to_fields_dict(edited)
             else:
                 st.info("Les champs seront disponibles après transcription.")
 
-    with st.expander(":material/description: Étape 3 · Générer le Rapport", expanded=bool(st.session_state.get("fields"))):
-        if not st.session_state.get("fields"):
-            st.info("Complétez d'abord les champs structurés.")
-        else:
-            if st.button(":material/picture_as_pdf: Générer le rapport", use_container_width=True):
-                handle_report_generation()
+        with st.expander(":material/description: Étape 3 · Générer le Rapport", expanded=bool(fields)):
+            if not fields:
+                st.info("Complétez d'abord les champs structurés.")
+            submitted = st.form_submit_button(
+                ":material/picture_as_pdf: Générer le rapport",
+                disabled=not fields,
+                use_container_width=True,
+            )
+
+    if submitted:
+        if edited is not None and not edited.equals(frame):  # untouched editor: keep the fields
+            st.session_state["fields"] = frame_to_fields_dict(edited)
+        handle_report_generation()
+
+    if st.session_state.get("report_text"):
+        show_report_preview(st.session_state["report_text"])
 
 
+@st.fragment
 def render_auto_workflow() -> None:
-    """UI for the single-click automated path."""
+    """UI for the single-click automated path (a fragment, like the manual flow)."""
 
     with st.expander(":material/bolt: Pipeline Automatique", expanded=True):
         st.markdown("Ce mode enchaîne transcription → analyse → génération sans validation.")
         audio_trigger_button(":material/robot_2: Lancer le pipeline automatique", handle_auto_pipeline)
 
-        if st.session_state.get("transcript"):
+        if st.session_state.get(TRANSCRIPT_WIDGET_KEY):
             st.text_area(
                 "Transcription générée",
-                value=st.session_state["transcript"],
+                value=st.session_state[TRANSCRIPT_WIDGET_KEY],
                 height=140,
                 disabled=True,
             )
@@ -462,6 +613,9 @@ def render_auto_workflow() -> None:
             st.caption("Champs détectés (lecture seule)")
             st.json(st.session_state["fields"])
 
+    if st.session_state.get("report_text"):
+        show_report_preview(st.session_state["report_text"])
+
 
 def main() -> None:
     """Streamlit entry point."""
@@ -494,9 +648,6 @@ def main() -> None:
     else:
         render_auto_workflow()
 
-    if st.session_state.get("report_text"):
-        show_report_preview(st.session_state["report_text"])
-
 
 if __name__ == "__main__":
     main()
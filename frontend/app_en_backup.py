@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import base64
+from pathlib import Path
 from typing import Dict, List, Optional
 
-import pandas as pd
 import streamlit as st
+from dotenv import load_dotenv
 
 from services.api import BackendClient
 
+load_dotenv(Path(__file__).resolve().parent / ".env", override=False)
+
 st.set_page_config(page_title="Rapporteur de Chantier", layout="wide", page_icon="🏗️")
 
 client = BackendClient()
@@ -40,12 +42,6 @@ def reset_workflow() -> None:
     st.session_state["mode"] = preserved_mode
 
 
-def encode_audio(audio_bytes: bytes) -> str:
-    """Base64-encode the audio clip so the backend accepts it."""
-
-    return base64.b64encode(audio_bytes).decode("utf-8")
-
-
 def data_editor_rows(fields: Dict[str, str]) -> List[Dict[str, str]]:
     """Turn the field dict into editor rows."""
 
@@ -83,10 +79,9 @@ def capture_audio() -> Optional[bytes]:
 def handle_transcription(audio_bytes: bytes, language: Optional[str]) -> None:
     """Proxy the recorded audio to the backend STT endpoint."""
 
-    encoded = encode_audio(audio_bytes)
     try:
         with st.spinner("Transcribing with GPT-4o-mini..."):
-            response = client.transcribe(encoded, language=language)
+            response = client.transcribe(audio_bytes, language=language)
     except Exception as exc:  # noqa: BLE001 - surface network issues in the UI
         st.error(f"Transcription failed: {exc}")
         return
@@ -139,10 +134,9 @@ def handle_report_generation() -> None:
 def handle_auto_pipeline(audio_bytes: bytes, language: Optional[str]) -> None:
     """Kick off the automated workflow endpoint."""
 
-    encoded = encode_audio(audio_bytes)
     try:
         with st.spinner("Running automated pipeline..."):
-            response = client.run_auto_pipeline(encoded, language=language)
+            response = client.run_auto_pipeline(audio_bytes, language=language)
     except Exception as exc:  # noqa: BLE001
         st.error(f"Automated pipeline failed: {exc}")
         return
@@ -163,15 +157,16 @@ def render_fields_editor() -> None:
 
     st.markdown(f"**Template:** `{st.session_state.get('template_type', 'n/a')}`")
     edited_rows = st.data_editor(
-        pd.DataFrame(data_editor_rows(fields)),
+        data_editor_rows(fields),
         num_rows="dynamic",
         hide_index=True,
         key="fields_editor",
     )
+    # Rows added with the "+" button come back with None cells
     cleaned = {
-        str(row["Field"]).strip(): str(row["Value"]).strip()
-        for _, row in edited_rows.iterrows()
-        if str(row["Field"]).strip()
+        str(row.get("Field") or "").strip(): str(row.get("Value") or "").strip()
+        for row in edited_rows
+        if str(row.get("Field") or "").strip()
     }
     st.session_state["fields"] = cleaned
 
@@ -2,15 +2,75 @@
 
 from __future__ import annotations
 
+import atexit
 import os
-from pathlib import Path
-from typing import Any, Dict, Optional
+import uuid
+from collections.abc import Iterator
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 import requests
-from dotenv import load_dotenv
-
-ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
-load_dotenv(dotenv_path=ENV_PATH, override=False)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .audio import compress_audio
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# One pool per backend host; Streamlit serves sessions from several threads at once.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+# Every call is a POST, which urllib3 does not retry unless told to. Only failures
+# where the backend cannot have done the work are retried: refused connections and
+# 502/503/504 from whatever sits in front of it (honouring Retry-After). Read errors
+# and timeouts are not, since the STT/LLM run may still be going and re-sending the
+# audio would pay for it again; 500 is a backend bug a retry would just repeat, and
+# Azure throttling is already retried by the openai SDK inside the backend. Jitter
+# keeps concurrent sessions from retrying in lockstep.
+RETRY_POLICY = Retry(
+    total=3,
+    read=False,
+    backoff_factor=0.4,
+    backoff_jitter=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+# (connect, read): an unreachable backend fails in seconds, slow LLM calls still fit.
+REQUEST_TIMEOUT = (5, 60)
+
+
+class MultipartAudioBody:
+    """Multipart body (form fields, then the audio) streamed in fixed-size chunks.
+
+    ``requests``' ``files=`` encoder builds the whole body in memory, i.e. a second
+    full-size copy of the recording; this yields memoryview slices instead. Defining
+    ``__len__`` lets ``requests`` send a Content-Length rather than chunked encoding.
+    """
+
+    def __init__(self, audio_bytes: bytes, filename: str, mime: str, form: Dict[str, str]) -> None:
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._audio = memoryview(audio_bytes)
+        self._head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+            for name, value in form.items()
+        ) + (
+            f"--{self.boundary}\r\nContent-Disposition: form-data; "
+            f'name="audio"; filename="{filename}"\r\nContent-Type: {mime}\r\n\r\n'
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+    def __len__(self) -> int:
+        return len(self._head) + len(self._audio) + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        for start in range(0, len(self._audio), UPLOAD_CHUNK_SIZE):
+            yield self._audio[start : start + UPLOAD_CHUNK_SIZE]
+        yield self._tail
 
 
 class BackendClient:
@@ -19,6 +79,18 @@ class BackendClient:
     def __init__(self, base_url: Optional[str] = None) -> None:
         env_url = base_url or os.getenv("BACKEND_URL", "http://localhost:8000")
         self.base_url = env_url.rstrip("/")
+        self._session = requests.Session()  # keep-alive: reuse TCP/TLS connections
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=RETRY_POLICY
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Drop the pooled connections (also registered to run at interpreter exit)."""
+
+        self._session.close()
 
     def _url(self, path: str) -> str:
         if not path.startswith("/"):
@@ -27,14 +99,37 @@ class BackendClient:
 
     def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = self._url(path)
-        response = requests.post(url, json={k: v for k, v in payload.items() if v is not None}, timeout=60)
+        response = self._session.post(url, json={k: v for k, v in payload.items() if v is not None}, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+    def _send_audio(
+        self, path: str, audio_bytes: bytes, form: Dict[str, Any], **kwargs: Any
+    ) -> requests.Response:
+        url = self._url(path)
+        payload, filename, mime = compress_audio(audio_bytes)
+        body = MultipartAudioBody(payload, filename, mime, {k: str(v) for k, v in form.items() if v is not None})
+        headers = {"Content-Type": body.content_type, **kwargs.pop("headers", {})}
+        response = self._session.post(url, data=body, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()  # a stream=True response would otherwise hold its pooled connection
+            raise
+        return response
+
+    def _post_audio(self, path: str, audio_bytes: bytes, form: Dict[str, Any]) -> Dict[str, Any]:
+        return orjson.loads(self._send_audio(path, audio_bytes, form).content)
 
-    def transcribe(self, audio_b64: str, language: Optional[str] = None) -> Dict[str, Any]:
-        """Send audio to `/api/transcribe`."""
+    def transcribe(self, audio_bytes: bytes, language: Optional[str] = None) -> Dict[str, Any]:
+        """Upload raw audio to `/api/transcribe/upload` (multipart, no base64)."""
 
-        return self._post("/api/transcribe", {"audio_b64": audio_b64, "language": language})
+        return self._post_audio("/api/transcribe/upload", audio_bytes, {"language": language})
+
+    def transcribe_and_infer(self, audio_bytes: bytes, language: Optional[str] = None) -> Dict[str, Any]:
+        """Transcribe and pre-fill the fields in one `/api/transcribe/template/upload` call."""
+
+        return self._post_audio("/api/transcribe/template/upload", audio_bytes, {"language": language})
 
     def infer_template(self, transcript: str) -> Dict[str, Any]:
         """Ask `/api/report/template` to pick the template."""
@@ -49,26 +144,46 @@ class BackendClient:
         payload = {"template_type": template_type, "fields": fields, "transcript": transcript}
         return self._post("/api/report/generate", payload)
 
-    def run_auto_pipeline(self, audio_b64: str, language: Optional[str] = None) -> Dict[str, Any]:
-        """Use `/api/pipeline/auto` for the fire-and-forget flow."""
+    def run_auto_pipeline(self, audio_bytes: bytes, language: Optional[str] = None) -> Dict[str, Any]:
+        """Use `/api/pipeline/auto/upload` for the fire-and-forget flow."""
+
+        return self._post_audio("/api/pipeline/auto/upload", audio_bytes, {"language": language})
+
+    def stream_auto_pipeline(
+        self, audio_bytes: bytes, language: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield `(event, data)` from `/api/pipeline/auto/upload/stream` as stages finish.
 
-        return self._post(
-            "/api/pipeline/auto",
-            {
-                "audio_b64": audio_b64,
-                "language": language,
-                "autopilot": True,
-            },
+        Events are `transcript`, `fields`, `report`, then `done`, or `error` with a
+        `detail` message.
+        """
+
+        response = self._send_audio(
+            "/api/pipeline/auto/upload/stream",
+            audio_bytes,
+            {"language": language},
+            stream=True,
+            headers={"Accept": "text/event-stream"},
         )
+        with response:
+            event = "message"
+            for line in response.iter_lines():
+                if line.startswith(b"event:"):
+                    event = line[len(b"event:") :].strip().decode()
+                elif line.startswith(b"data:"):
+                    yield event, orjson.loads(line[len(b"data:") :])
+                    event = "message"
 
     def download_docx(self, fields: Dict[str, str], template_type: str = "probleme_decouverte") -> bytes:
         """Download a DOCX report via `/api/report/download/docx`."""
 
         url = self._url("/api/report/download/docx")
-        response = requests.post(
+        with self._session.post(
             url,
             json={"fields": fields, "template_type": template_type},
-            timeout=60,
-        )
-        response.raise_for_status()
-        return response.content
+            timeout=REQUEST_TIMEOUT,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            # one read off the socket instead of iter_content chunks joined by .content
+            return response.raw.read(decode_content=True)
@@ -0,0 +1,78 @@
+"""Shrink browser recordings before upload (Ogg/Opus or FLAC instead of PCM WAV)."""
+
+from __future__ import annotations
+
+import io
+from functools import lru_cache
+from typing import Tuple
+
+try:  # libsndfile ships inside the wheel; without it recordings go up as recorded
+    import numpy as np
+    import soundfile
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    soundfile = None
+
+WAV_UPLOAD = ("recording.wav", "audio/wav")
+OPUS_UPLOAD = ("recording.ogg", "audio/ogg")
+FLAC_UPLOAD = ("recording.flac", "audio/flac")
+
+# The transcription model works on 16 kHz mono, so anything recorded richer than that
+# is downmixed and resampled first. Opus only supports the rates below; anything else
+# (e.g. an 11.025 kHz clip) is packed losslessly as FLAC instead.
+TARGET_SAMPLE_RATE = 16000
+OPUS_SAMPLE_RATES = frozenset({8000, 12000, 16000, 24000, 48000})
+LOWPASS_HALF_WIDTH = 64  # taps on each side of the anti-aliasing filter
+
+
+def _to_speech_rate(samples: "np.ndarray", sample_rate: int) -> Tuple["np.ndarray", int]:
+    """Downmix to mono and, above 16 kHz, low-pass then resample to 16 kHz."""
+
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1, dtype=np.float32)
+    if sample_rate <= TARGET_SAMPLE_RATE:
+        return samples, sample_rate
+
+    # Windowed-sinc low-pass just under the new Nyquist frequency, so the
+    # interpolation below does not fold high frequencies back into the speech band.
+    cutoff = 0.45 * TARGET_SAMPLE_RATE / sample_rate
+    taps = np.arange(-LOWPASS_HALF_WIDTH, LOWPASS_HALF_WIDTH + 1)
+    kernel = np.sinc(2 * cutoff * taps) * np.hamming(taps.size)
+    filtered = np.convolve(samples, kernel / kernel.sum(), mode="same")
+
+    length = int(len(samples) * TARGET_SAMPLE_RATE / sample_rate)
+    positions = np.arange(length) * (sample_rate / TARGET_SAMPLE_RATE)
+    resampled = np.interp(positions, np.arange(len(filtered)), filtered)
+    return resampled.astype(np.float32), TARGET_SAMPLE_RATE
+
+
+@lru_cache(maxsize=4)
+def compress_audio(audio_bytes: bytes) -> Tuple[bytes, str, str]:
+    """Return ``(payload, filename, mime)`` for uploading a WAV recording.
+
+    Recordings are reduced to 16 kHz mono first; speech at that rate comes out
+    roughly 9x smaller as Opus. Input that is not WAV, or that libsndfile cannot
+    handle, is returned untouched. Memoized so pressing a button twice on the same
+    recording encodes it once.
+    """
+
+    if soundfile is None or not audio_bytes.startswith(b"RIFF"):
+        return (audio_bytes, *WAV_UPLOAD)
+
+    try:
+        samples, sample_rate = soundfile.read(io.BytesIO(audio_bytes), dtype="float32")
+        samples, sample_rate = _to_speech_rate(samples, sample_rate)
+        out = io.BytesIO()
+        if sample_rate in OPUS_SAMPLE_RATES:
+            soundfile.write(out, samples, sample_rate, format="OGG", subtype="OPUS")
+            upload = OPUS_UPLOAD
+        else:
+            soundfile.write(out, samples, sample_rate, format="FLAC", subtype="PCM_16")
+            upload = FLAC_UPLOAD
+    except (RuntimeError, ValueError, TypeError):  # LibsndfileError is a RuntimeError
+        return (audio_bytes, *WAV_UPLOAD)
+
+    compressed = out.getvalue()
+    if len(compressed) >= len(audio_bytes):
+        return (audio_bytes, *WAV_UPLOAD)
+    return (compressed, *upload)
@@ -0,0 +1,108 @@
+"""Round-trip tests for the streamed multipart body in services.api.
+
+The body is posted to the backend's real upload route, so these run wherever the
+backend's dependencies are installed next to the frontend's and skip otherwise.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pytest
+import requests
+
+from services import api
+from services.api import BackendClient, MultipartAudioBody
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+AUDIO = bytes(range(256)) * 1024  # 256 KiB: several upload chunks plus a partial one
+
+
+@pytest.fixture()
+def upload_route(monkeypatch: pytest.MonkeyPatch) -> Iterator[Tuple[object, Dict[str, object]]]:
+    pytest.importorskip("fastapi")
+    pytest.importorskip("multipart")
+    monkeypatch.syspath_prepend(str(BACKEND_DIR))
+    monkeypatch.setenv("AZURE_OPENAI_KEY", "test")
+
+    from fastapi.testclient import TestClient
+
+    from app.api.routes import workflow
+    from app.core.config import get_settings
+    from app.main import create_app
+
+    get_settings.cache_clear()
+    seen: Dict[str, object] = {}
+
+    async def read_upload(audio) -> bytes:
+        seen.update(filename=audio.filename, content_type=audio.content_type)
+        seen["audio"] = await audio.read()
+        return seen["audio"]
+
+    async def transcribe(audio_bytes: bytes, language: Optional[str] = None) -> str:
+        seen["language"] = language
+        return "fuite au R+2"
+
+    monkeypatch.setattr(workflow, "_read_upload_or_400", read_upload)
+    monkeypatch.setattr(workflow, "transcribe_audio", transcribe)
+    yield TestClient(create_app()), seen
+    get_settings.cache_clear()
+
+
+class TestMultipartAudioBody:
+    def test_length_matches_the_streamed_bytes(self) -> None:
+        body = MultipartAudioBody(AUDIO, "recording.ogg", "audio/ogg", {"language": "fr"})
+        chunks = list(body)
+        assert len(body) == sum(len(chunk) for chunk in chunks)
+        assert max(len(chunk) for chunk in chunks) <= max(api.UPLOAD_CHUNK_SIZE, len(chunks[0]))
+
+    def test_upload_route_parses_the_body(self, upload_route: tuple) -> None:
+        client, seen = upload_route
+        body = MultipartAudioBody(AUDIO, "recording.ogg", "audio/ogg", {"language": "fr"})
+        payload = b"".join(body)
+
+        response = client.post(
+            "/api/transcribe/upload",
+            content=payload,
+            headers={"Content-Type": body.content_type, "Content-Length": str(len(body))},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"text": "fuite au R+2"}
+        assert seen == {
+            "filename": "recording.ogg",
+            "content_type": "audio/ogg",
+            "audio": AUDIO,
+            "language": "fr",
+        }
+
+    def test_boundary_is_unique_per_body(self) -> None:
+        first = MultipartAudioBody(AUDIO, "recording.wav", "audio/wav", {})
+        second = MultipartAudioBody(AUDIO, "recording.wav", "audio/wav", {})
+        assert first.boundary != second.boundary
+        assert first.content_type == f"multipart/form-data; boundary={first.boundary}"
+
+
+class _ErrorResponse(requests.Response):
+    def __init__(self) -> None:
+        super().__init__()
+        self.status_code = 500
+        self.url = "http://backend/api/pipeline/auto/upload/stream"
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestSendAudio:
+    def test_error_response_is_closed_before_raising(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client = BackendClient("http://backend")
+        response = _ErrorResponse()
+        monkeypatch.setattr(client._session, "post", lambda *args, **kwargs: response)
+
+        with pytest.raises(requests.HTTPError):
+            list(client.stream_auto_pipeline(b"RIFF"))
+        assert response.closed
@@ -0,0 +1,110 @@
+"""Unit tests for the upload compression in services.audio."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+
+import pytest
+
+np = pytest.importorskip("numpy")
+soundfile = pytest.importorskip("soundfile")
+
+from services import audio  # noqa: E402
+from services.audio import (  # noqa: E402
+    FLAC_UPLOAD,
+    OPUS_UPLOAD,
+    TARGET_SAMPLE_RATE,
+    WAV_UPLOAD,
+    _to_speech_rate,
+    compress_audio,
+)
+
+
+def _tone(sample_rate: int, freq: float = 440.0, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    out = io.BytesIO()
+    soundfile.write(out, samples, sample_rate, format="WAV", subtype="PCM_16")
+    return out.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> Iterator[None]:
+    compress_audio.cache_clear()
+    yield
+    compress_audio.cache_clear()
+
+
+class TestToSpeechRate:
+    def test_downmixes_stereo(self) -> None:
+        tone = _tone(16000)
+        mono, rate = _to_speech_rate(np.stack([tone, tone], axis=1), 16000)
+        assert rate == 16000
+        assert mono.ndim == 1
+        np.testing.assert_allclose(mono, tone, atol=1e-6)
+
+    def test_resamples_to_16khz_and_keeps_duration(self) -> None:
+        resampled, rate = _to_speech_rate(_tone(48000), 48000)
+        assert rate == TARGET_SAMPLE_RATE
+        assert len(resampled) == TARGET_SAMPLE_RATE
+        assert resampled.dtype == np.float32
+
+    def test_speech_band_passes_through(self) -> None:
+        resampled, _ = _to_speech_rate(_tone(48000, freq=1000) * 2, 48000)
+        assert np.abs(resampled[200:-200]).max() == pytest.approx(1.0, abs=0.01)
+
+    def test_tone_above_new_nyquist_does_not_alias(self) -> None:
+        # 12 kHz would fold back to 4 kHz at 16 kHz without the low-pass filter
+        resampled, _ = _to_speech_rate(_tone(48000, freq=12000) * 2, 48000)
+        assert np.abs(resampled[200:-200]).max() < 0.01
+
+    def test_low_rates_are_left_alone(self) -> None:
+        tone = _tone(11025)
+        samples, rate = _to_speech_rate(tone, 11025)
+        assert rate == 11025
+        assert samples is tone
+
+
+class TestCompressAudio:
+    @pytest.mark.parametrize("sample_rate, channels", [(48000, 2), (44100, 1), (16000, 1)])
+    def test_recordings_become_16khz_mono_opus(self, sample_rate: int, channels: int) -> None:
+        tone = _tone(sample_rate)
+        wav = _wav(np.stack([tone] * channels, axis=1) if channels > 1 else tone, sample_rate)
+        payload, filename, mime = compress_audio(wav)
+
+        assert (filename, mime) == OPUS_UPLOAD
+        assert len(payload) < len(wav)
+        info = soundfile.info(io.BytesIO(payload))
+        assert (info.samplerate, info.channels) == (TARGET_SAMPLE_RATE, 1)
+        assert info.frames == TARGET_SAMPLE_RATE  # one second in, one second out
+
+    def test_rates_opus_cannot_take_are_packed_losslessly(self) -> None:
+        wav = _wav(_tone(11025), 11025)
+        payload, filename, mime = compress_audio(wav)
+
+        assert (filename, mime) == FLAC_UPLOAD
+        decoded, rate = soundfile.read(io.BytesIO(payload), dtype="int16")
+        original, _ = soundfile.read(io.BytesIO(wav), dtype="int16")
+        assert rate == 11025
+        np.testing.assert_array_equal(decoded, original)
+
+    def test_non_wav_input_is_returned_untouched(self) -> None:
+        assert compress_audio(b"OggS\x00\x02") == (b"OggS\x00\x02", *WAV_UPLOAD)
+
+    def test_unreadable_wav_is_returned_untouched(self) -> None:
+        assert compress_audio(b"RIFFjunk") == (b"RIFFjunk", *WAV_UPLOAD)
+
+    def test_output_that_would_grow_falls_back_to_the_original(self) -> None:
+        wav = _wav(_tone(16000, seconds=0.001), 16000)
+        assert compress_audio(wav) == (wav, *WAV_UPLOAD)
+
+    def test_without_soundfile_recordings_go_up_as_recorded(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(audio, "soundfile", None)
+        wav = _wav(_tone(48000), 48000)
+        assert compress_audio(wav) == (wav, *WAV_UPLOAD)
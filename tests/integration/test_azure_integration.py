@@ -1,7 +1,6 @@
 """Quick smoke tests for the Azure STT and LLM helpers."""
 
 import asyncio
-import base64
 import sys
 from importlib import import_module
 from pathlib import Path
@@ -63,12 +62,11 @@ async def test_stt(audio_file_path: str = None):
 
         print(f"\n📂 Reading audio file: {audio_path.name}")
         audio_bytes = audio_path.read_bytes()
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
 
         print(f"📊 Audio size: {len(audio_bytes)} bytes")
         print("⏳ Transcribing...")
 
-        transcript = await transcribe_audio(audio_b64, language="en")
+        transcript = await transcribe_audio(audio_bytes, language="en")
 
         print(f"\n✅ Transcript: {transcript}")
         print("\n✅ STT test PASSED!")